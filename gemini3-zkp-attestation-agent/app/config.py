@@ -70,6 +70,9 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 24
     
+    # Security - Passwords
+    BCRYPT_ROUNDS: int = 12
+    
     # Security - Encryption
     ENCRYPTION_KEY: str = "your-encryption-key-32-bytes-here"
     ENCRYPTION_ALGORITHM: str = "AES-256-GCM"
@@ -3,11 +3,16 @@ Attestation Package Builder
 Assembles complete attestation packages with evidence, proofs, and metadata
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import sys
 import json
+import hashlib
+import hmac
+import orjson
 from pydantic import BaseModel, Field
 
 from app.models.claim import Claim
@@ -35,6 +40,29 @@ class AttestationFormat(str, Enum):
     XML = "xml"
 
 
+# Same output as json.dumps(..., sort_keys=True); reused for the hash preimage
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True)
+
+# Length of a hex-encoded SHA-256 package hash
+_SHA256_HEX_LENGTH = 64
+
+# Number of evidence bundles / proofs encoded per encoder call when hashing
+_HASH_BATCH_SIZE = 256
+
+# Fields that change after assembly; persisted in the `.state.json` sidecar
+_STATE_FIELDS = ("status", "signature", "signature_algorithm", "assembled_at", "signed_at", "published_at")
+_STATE_SUFFIX = ".state.json"
+
+# Claim attributes copied verbatim into claim_data (created_at is serialized separately)
+_CLAIM_FIELDS = ("claim_id", "claim_type", "claim_statement", "tenant_id", "status")
+
+# Low-cardinality string fields shared across many packages; interned on load
+_INTERNED_FIELDS = ("tenant_id", "status", "attestation_type", "compliance_framework")
+
+# Upper bound on threads used to read package files concurrently
+_MAX_READ_WORKERS = 32
+
+
 class AttestationPackage(BaseModel):
     """
     Complete attestation package
@@ -76,24 +104,105 @@ class AttestationPackage(BaseModel):
     signed_at: Optional[datetime] = Field(None)
     published_at: Optional[datetime] = Field(None)
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    # Bumped by builder mutators; lets validation skip re-hashing unchanged content
+    _content_version: int = 0
+    _validated_state: Optional[Tuple[int, str]] = None
+    _digest_cache: Optional[Tuple[int, bytes]] = None
+    
+    def mark_content_changed(self):
+        """Record that hashed content changed since the last validation"""
+        self._content_version += 1
+    
+    def is_hash_validated(self) -> bool:
+        """Check whether package_hash was already verified for the current content"""
+        return self._validated_state == (self._content_version, self.package_hash)
+    
+    def mark_hash_validated(self, digest: Optional[bytes] = None):
+        """
+        Remember that package_hash matches the current content
+        
+        Args:
+            digest: Digest just computed for the content, kept for content_digest
+        """
+        self._validated_state = (self._content_version, self.package_hash)
+        if digest is not None:
+            self._digest_cache = (self._content_version, digest)
+    
+    def content_digest(self) -> bytes:
+        """
+        Get the content digest, computed at most once per content version
+        
+        Relies on content being changed through the builder (which calls
+        mark_content_changed); integrity checks that must catch out-of-band
+        edits call compute_digest instead.
+        """
+        cached = self._digest_cache
+        if cached is not None and cached[0] == self._content_version:
+            return cached[1]
+        
+        digest = self.compute_digest()
+        self._digest_cache = (self._content_version, digest)
+        return digest
     
     def compute_hash(self) -> str:
-        """Compute hash of package content"""
-        content = {
-            "package_id": self.package_id,
-            "claim_id": self.claim_id,
-            "claim_data": self.claim_data,
-            "evidence_bundles": self.evidence_bundles,
-            "proofs": self.proofs,
-            "version": self.version
-        }
-        content_str = json.dumps(content, sort_keys=True)
-        hash_utils = HashUtils()
-        return hash_utils.sha256(content_str.encode())
+        """
+        Compute hash of package content
+        
+        Returns:
+            Hex-encoded SHA-256 of the content (see compute_digest)
+        """
+        return self.compute_digest().hex()
+    
+    def compute_digest(self) -> bytes:
+        """
+        Compute the raw SHA-256 digest of package content
+        
+        The preimage is the sorted-key JSON of package_id, claim_id,
+        claim_data, evidence_bundles, proofs and version. It is fed to
+        SHA-256 field by field (and in batches for the lists) so the
+        full document is never materialized as one string.
+        
+        The preimage format is fixed: package_hash is persisted, signed and
+        anchored, so switching canonicalization (e.g. to CBOR) would
+        invalidate every existing package.
+        """
+        encode = _CANONICAL_ENCODER.encode
+        digest = hashlib.sha256()
+        
+        digest.update(b'{"claim_data": ')
+        digest.update(encode(self.claim_data).encode())
+        digest.update(b', "claim_id": ')
+        digest.update(encode(self.claim_id).encode())
+        digest.update(b', "evidence_bundles": ')
+        _update_json_array(digest, self.evidence_bundles)
+        digest.update(b', "package_id": ')
+        digest.update(encode(self.package_id).encode())
+        digest.update(b', "proofs": ')
+        _update_json_array(digest, self.proofs)
+        digest.update(b', "version": ')
+        digest.update(encode(self.version).encode())
+        digest.update(b"}")
+        
+        return digest.digest()
+
+
+def _update_json_array(digest, items: List[Any]):
+    """
+    Feed the canonical JSON array encoding of items into digest
+    
+    Items are encoded _HASH_BATCH_SIZE at a time, one encoder call per
+    batch, with the surrounding brackets sliced off each batch so the
+    bytes match a single json.dumps of the whole list.
+    """
+    encode = _CANONICAL_ENCODER.encode
+    
+    digest.update(b"[")
+    for start in range(0, len(items), _HASH_BATCH_SIZE):
+        if start:
+            digest.update(b", ")
+        chunk = encode(items[start:start + _HASH_BATCH_SIZE]).encode()
+        digest.update(memoryview(chunk)[1:-1])
+    digest.update(b"]")
 
 
 class AttestationPackageBuilder:
@@ -111,6 +220,10 @@ class AttestationPackageBuilder:
         self.packages_path = packages_path or Path("./packages")
         self.packages_path.mkdir(parents=True, exist_ok=True)
         self.hash_utils = HashUtils()
+        
+        # package_id -> (tenant_id, status, path), loaded lazily on first listing
+        self._index: Dict[str, Tuple[str, AttestationStatus, Path]] = {}
+        self._index_loaded = False
     
     def create_package(
         self,
@@ -142,16 +255,12 @@ class AttestationPackageBuilder:
         package_id = self._generate_package_id(claim.claim_id)
         
         # Extract claim data
-        claim_data = {
-            "claim_id": claim.claim_id,
-            "claim_type": claim.claim_type,
-            "claim_statement": claim.claim_statement,
-            "tenant_id": claim.tenant_id,
-            "status": claim.status,
-            "created_at": claim.created_at.isoformat() if claim.created_at else None
-        }
+        claim_data = {field: getattr(claim, field) for field in _CLAIM_FIELDS}
+        claim_data["created_at"] = claim.created_at.isoformat() if claim.created_at else None
         
-        package = AttestationPackage(
+        # Inputs come from an already-validated claim and API request, so skip
+        # re-validation; defaults (timestamps, empty lists) are still applied
+        package = AttestationPackage.model_construct(
             package_id=package_id,
             claim_id=claim.claim_id,
             tenant_id=claim.tenant_id,
@@ -194,6 +303,7 @@ class AttestationPackageBuilder:
         }
         
         package.evidence_bundles.append(bundle_data)
+        package.mark_content_changed()
         
         return package
     
@@ -228,6 +338,7 @@ class AttestationPackageBuilder:
             proof_data["proof_data"] = proof.proof_data
         
         package.proofs.append(proof_data)
+        package.mark_content_changed()
         
         return package
     
@@ -251,7 +362,9 @@ class AttestationPackageBuilder:
         
         # Compute package hash
         if include_checksums:
-            package.package_hash = package.compute_hash()
+            digest = package.content_digest()
+            package.package_hash = digest.hex()
+            package.mark_hash_validated(digest)
         
         # Update status and timestamp
         package.status = AttestationStatus.ASSEMBLED
@@ -289,11 +402,20 @@ class AttestationPackageBuilder:
         if not package.evidence_bundles and not package.proofs:
             raise ValidationError("Package must contain evidence or proofs")
         
-        # Verify hash if present
-        if package.package_hash:
-            computed_hash = package.compute_hash()
-            if computed_hash != package.package_hash:
+        # Verify hash if present (skipped when content is unchanged since last check)
+        if package.package_hash and not package.is_hash_validated():
+            # Compare raw 32-byte digests in constant time; a stored hash of the
+            # wrong length (or not hex at all) is rejected without hashing
+            if len(package.package_hash) != _SHA256_HEX_LENGTH:
                 raise ValidationError("Package hash mismatch - content has been modified")
+            try:
+                stored_digest = bytes.fromhex(package.package_hash)
+            except ValueError:
+                raise ValidationError("Package hash mismatch - content has been modified")
+            digest = package.compute_digest()
+            if not hmac.compare_digest(digest, stored_digest):
+                raise ValidationError("Package hash mismatch - content has been modified")
+            package.mark_hash_validated(digest)
         
         return True
     
@@ -321,8 +443,8 @@ class AttestationPackageBuilder:
         elif new_status == AttestationStatus.PUBLISHED and not package.published_at:
             package.published_at = datetime.utcnow()
         
-        # Store updated package
-        self._store_package(package)
+        # Only the small state sidecar changes on a status transition
+        self._store_state(package)
         
         return package
     
@@ -345,6 +467,7 @@ class AttestationPackageBuilder:
             package.claim_data["metadata"] = {}
         
         package.claim_data["metadata"].update(metadata)
+        package.mark_content_changed()
         
         return package
     
@@ -377,6 +500,33 @@ class AttestationPackageBuilder:
             "package_hash": package.package_hash
         }
     
+    @staticmethod
+    def _summary_from_data(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Project a stored package document onto the summary shape
+        
+        Works on the raw decoded JSON, so datetimes and enums are already
+        serialized and no AttestationPackage needs to be constructed.
+        """
+        return {
+            "package_id": data["package_id"],
+            "claim_id": data["claim_id"],
+            "title": data["title"],
+            "status": data["status"],
+            "attestation_type": data["attestation_type"],
+            "compliance_framework": data.get("compliance_framework"),
+            "evidence_count": len(data.get("evidence_bundles") or ()),
+            "proof_count": len(data.get("proofs") or ()),
+            "issuer": data["issuer"],
+            "valid_from": data["valid_from"],
+            "valid_until": data.get("valid_until"),
+            "created_at": data["created_at"],
+            "assembled_at": data.get("assembled_at"),
+            "signed_at": data.get("signed_at"),
+            "is_signed": data.get("signature") is not None,
+            "package_hash": data.get("package_hash")
+        }
+    
     def _generate_package_id(self, claim_id: str) -> str:
         """Generate unique package ID"""
         timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
@@ -385,9 +535,133 @@ class AttestationPackageBuilder:
         return f"pkg_{claim_id}_{hash_suffix}"
     
     def _store_package(self, package: AttestationPackage):
-        """Store package to disk"""
+        """Store full package content to disk"""
+        package_file = self.packages_path / f"{package.package_id}.json"
+        # Compact on disk; export_package produces the indented, human-readable form
+        package_file.write_text(package.model_dump_json())
+        
+        # The full document now carries the current state
+        self._state_file(package_file).unlink(missing_ok=True)
+        
+        if self._index_loaded:
+            self._index[package.package_id] = (package.tenant_id, package.status, package_file)
+    
+    def _store_state(self, package: AttestationPackage):
+        """Store only the mutable state fields next to the package content"""
         package_file = self.packages_path / f"{package.package_id}.json"
-        package_file.write_text(package.json(indent=2))
+        
+        if not package_file.exists():
+            self._store_package(package)
+            return
+        
+        state = {field: getattr(package, field) for field in _STATE_FIELDS}
+        self._state_file(package_file).write_bytes(orjson.dumps(state))
+        
+        if self._index_loaded:
+            self._index[package.package_id] = (package.tenant_id, package.status, package_file)
+    
+    @staticmethod
+    def _state_file(package_file: Path) -> Path:
+        """Get the state sidecar path for a package file"""
+        return package_file.with_name(package_file.stem + _STATE_SUFFIX)
+    
+    def _read_package_data(self, package_file: Path) -> Dict[str, Any]:
+        """Read stored package content merged with its state sidecar"""
+        data = orjson.loads(package_file.read_bytes())
+        
+        state_file = self._state_file(package_file)
+        if state_file.exists():
+            data.update(orjson.loads(state_file.read_bytes()))
+        
+        for field in _INTERNED_FIELDS:
+            value = data.get(field)
+            if isinstance(value, str):
+                data[field] = sys.intern(value)
+        
+        return data
+    
+    def _try_read_package_data(self, package_file: Path) -> Optional[Dict[str, Any]]:
+        """Read package data, returning None for unreadable or corrupt files"""
+        try:
+            return self._read_package_data(package_file)
+        except Exception:
+            return None
+    
+    def _read_many(self, package_files: List[Path]) -> List[Tuple[Path, Dict[str, Any]]]:
+        """
+        Read several package files concurrently
+        
+        File reads and orjson parsing release the GIL, so a thread pool
+        overlaps disk latency on cold caches and network filesystems.
+        
+        Args:
+            package_files: Package content files to read
+        
+        Returns:
+            (file, data) pairs for each readable file, in input order
+        """
+        if len(package_files) <= 1:
+            results = [self._try_read_package_data(f) for f in package_files]
+        else:
+            with ThreadPoolExecutor(max_workers=min(_MAX_READ_WORKERS, len(package_files))) as executor:
+                results = list(executor.map(self._try_read_package_data, package_files))
+        
+        return [(f, data) for f, data in zip(package_files, results) if data is not None]
+    
+    def _matching_data(
+        self,
+        tenant_id: Optional[str],
+        status: Optional[AttestationStatus]
+    ) -> List[Tuple[Path, Dict[str, Any]]]:
+        """
+        Read the packages whose tenant and status match the filters
+        
+        The first listing scans every package to build the index and
+        filters the data it already read; later listings filter on the
+        index and read only the matching files.
+        """
+        if not self._index_loaded:
+            return [
+                (package_file, data)
+                for package_file, data in self._load_index()
+                if (not tenant_id or data["tenant_id"] == tenant_id)
+                and (not status or data["status"] == status)
+            ]
+        
+        return self._read_many([
+            package_file
+            for package_tenant_id, package_status, package_file in list(self._index.values())
+            if (not tenant_id or package_tenant_id == tenant_id)
+            and (not status or package_status == status)
+        ])
+    
+    def _load_index(self) -> List[Tuple[Path, Dict[str, Any]]]:
+        """
+        Scan the packages directory once, indexing the fields used for filtering
+        
+        Returns:
+            (file, data) pairs for each indexed package
+        """
+        package_files = [
+            package_file
+            for package_file in self.packages_path.glob("*.json")
+            if not package_file.name.endswith(_STATE_SUFFIX)
+        ]
+        
+        indexed = []
+        for package_file, data in self._read_many(package_files):
+            try:
+                self._index[data["package_id"]] = (
+                    data["tenant_id"],
+                    AttestationStatus(data["status"]),
+                    package_file
+                )
+            except Exception:
+                continue
+            indexed.append((package_file, data))
+        
+        self._index_loaded = True
+        return indexed
     
     def load_package(self, package_id: str) -> Optional[AttestationPackage]:
         """
@@ -402,7 +676,7 @@ class AttestationPackageBuilder:
         package_file = self.packages_path / f"{package_id}.json"
         
         if package_file.exists():
-            return AttestationPackage.parse_raw(package_file.read_text())
+            return AttestationPackage.model_validate(self._read_package_data(package_file))
         
         return None
     
@@ -421,25 +695,45 @@ class AttestationPackageBuilder:
         Returns:
             List of packages
         """
+        # Filters are applied on the index before touching the full package files
         packages = []
         
-        for package_file in self.packages_path.glob("*.json"):
+        for _, data in self._matching_data(tenant_id, status):
             try:
-                package = AttestationPackage.parse_raw(package_file.read_text())
-                
-                # Apply filters
-                if tenant_id and package.tenant_id != tenant_id:
-                    continue
-                
-                if status and package.status != status:
-                    continue
-                
-                packages.append(package)
+                packages.append(AttestationPackage.model_validate(data))
             except:
                 continue
         
         return packages
     
+    def list_package_summaries(
+        self,
+        tenant_id: Optional[str] = None,
+        status: Optional[AttestationStatus] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List package summaries without building full package models
+        
+        Intended for dashboard/listing views that only need the fields
+        returned by get_package_summary.
+        
+        Args:
+            tenant_id: Filter by tenant
+            status: Filter by status
+        
+        Returns:
+            List of summary dictionaries
+        """
+        summaries = []
+        
+        for _, data in self._matching_data(tenant_id, status):
+            try:
+                summaries.append(self._summary_from_data(data))
+            except Exception:
+                continue
+        
+        return summaries
+    
     def export_package(
         self,
         package: AttestationPackage,
@@ -461,7 +755,7 @@ class AttestationPackageBuilder:
             output_path = self.packages_path / f"{package.package_id}.{format.value}"
         
         if format == AttestationFormat.JSON:
-            output_path.write_text(package.json(indent=2))
+            output_path.write_text(package.model_dump_json(indent=2))
         else:
             # Other formats handled by specialized exporters
             raise NotImplementedError(f"Export to {format.value} not implemented in base builder")
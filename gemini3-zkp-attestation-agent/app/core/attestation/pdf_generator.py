@@ -3,241 +3,161 @@ PDF Report Generator
 Generates professional PDF reports for attestation packages
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, BinaryIO, List, Optional, Tuple
 from datetime import datetime
+from html import escape
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from pydantic import BaseModel, Field
-import json
+import os
+import hashlib
+import tempfile
+import logging
+import orjson
 
 from app.core.attestation.package_builder import AttestationPackage
-from app.utils.errors import ValidationError
+from app.utils.errors import ValidationError, ExternalServiceError
 
+logger = logging.getLogger(__name__)
 
-class PDFReport(BaseModel):
-    """
-    PDF report metadata
-    """
-    report_id: str = Field(..., description="Report identifier")
-    package_id: str = Field(..., description="Associated package ID")
-    file_path: str = Field(..., description="Path to PDF file")
-    file_size: int = Field(..., description="File size in bytes")
-    page_count: int = Field(..., description="Number of pages")
-    generated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+# PDF backends are optional and picked once at import: WeasyPrint, then
+# xhtml2pdf, otherwise simulated output
+HTML = CSS = FontConfiguration = pisa = None
+try:
+    from weasyprint import HTML, CSS
+    try:
+        from weasyprint.text.fonts import FontConfiguration
+    except ImportError:
+        FontConfiguration = None
+    PDF_BACKEND = "weasyprint"
+except Exception:
+    try:
+        from xhtml2pdf import pisa
+        PDF_BACKEND = "xhtml2pdf"
+    except Exception:
+        PDF_BACKEND = "simulated"
 
 
-class PDFGenerator:
-    """
-    Generates PDF reports from attestation packages
-    
-    Note: This is a simplified implementation. In production, use libraries like:
-    - ReportLab
-    - WeasyPrint
-    - xhtml2pdf
-    """
-    
-    def __init__(self, output_path: Optional[Path] = None):
-        """
-        Initialize PDF generator
-        
-        Args:
-            output_path: Path for PDF outputs
-        """
-        self.output_path = output_path or Path("./exports/pdf")
-        self.output_path.mkdir(parents=True, exist_ok=True)
-    
-    def generate_attestation_report(
-        self,
-        package: AttestationPackage,
-        include_evidence: bool = True,
-        include_proofs: bool = True,
-        template: str = "standard"
-    ) -> PDFReport:
-        """
-        Generate PDF attestation report
-        
-        Args:
-            package: Attestation package
-            include_evidence: Include evidence details
-            include_proofs: Include proof details
-            template: Report template to use
-        
-        Returns:
-            PDFReport metadata
-        """
-        # Generate HTML content
-        html_content = self._generate_html(
-            package,
-            include_evidence=include_evidence,
-            include_proofs=include_proofs,
-            template=template
-        )
-        
-        # Generate PDF filename
-        filename = f"{package.package_id}_report.pdf"
-        file_path = self.output_path / filename
-        
-        # Convert HTML to PDF (simulated)
-        # In production, use actual PDF library
-        pdf_content = self._html_to_pdf(html_content)
-        
-        # Write PDF
-        file_path.write_bytes(pdf_content)
-        
-        # Create report metadata
-        report = PDFReport(
-            report_id=f"report_{package.package_id}",
-            package_id=package.package_id,
-            file_path=str(file_path),
-            file_size=len(pdf_content),
-            page_count=self._estimate_page_count(html_content)
-        )
-        
-        return report
-    
-    def generate_executive_summary(
-        self,
-        package: AttestationPackage
-    ) -> PDFReport:
-        """
-        Generate executive summary PDF
-        
-        Args:
-            package: Attestation package
-        
-        Returns:
-            PDFReport metadata
-        """
-        html_content = self._generate_executive_summary_html(package)
-        
-        filename = f"{package.package_id}_executive_summary.pdf"
-        file_path = self.output_path / filename
-        
-        pdf_content = self._html_to_pdf(html_content)
-        file_path.write_bytes(pdf_content)
-        
-        report = PDFReport(
-            report_id=f"summary_{package.package_id}",
-            package_id=package.package_id,
-            file_path=str(file_path),
-            file_size=len(pdf_content),
-            page_count=1
-        )
-        
-        return report
-    
-    def generate_compliance_report(
-        self,
-        package: AttestationPackage,
-        framework: str
-    ) -> PDFReport:
-        """
-        Generate framework-specific compliance report
-        
-        Args:
-            package: Attestation package
-            framework: Compliance framework (SOC2, ISO27001, etc.)
-        
-        Returns:
-            PDFReport metadata
-        """
-        html_content = self._generate_compliance_html(package, framework)
-        
-        filename = f"{package.package_id}_{framework}_compliance.pdf"
-        file_path = self.output_path / filename
-        
-        pdf_content = self._html_to_pdf(html_content)
-        file_path.write_bytes(pdf_content)
-        
-        report = PDFReport(
-            report_id=f"compliance_{package.package_id}_{framework}",
-            package_id=package.package_id,
-            file_path=str(file_path),
-            file_size=len(pdf_content),
-            page_count=self._estimate_page_count(html_content)
-        )
-        
-        return report
-    
-    def _generate_html(
-        self,
-        package: AttestationPackage,
-        include_evidence: bool,
-        include_proofs: bool,
-        template: str
-    ) -> str:
-        """Generate HTML content for PDF"""
-        html = f"""
+def _render_weasyprint(html_content: str, target: BinaryIO, stylesheet: Any, font_config: Any):
+    """Render with WeasyPrint using a pre-parsed stylesheet"""
+    HTML(string=html_content).write_pdf(
+        target=target,
+        stylesheets=[stylesheet],
+        font_config=font_config
+    )
+
+
+def _render_xhtml2pdf(html_content: str, target: BinaryIO, stylesheet: Any, font_config: Any):
+    """Render with xhtml2pdf; styles stay inline in the HTML"""
+    result = pisa.CreatePDF(html_content, dest=target)
+    if result.err:
+        raise ExternalServiceError(f"xhtml2pdf failed to render report ({result.err} errors)")
+
+
+def _render_simulated(html_content: str, target: BinaryIO, stylesheet: Any, font_config: Any):
+    """Simulate PDF output by storing the HTML behind a PDF header"""
+    target.write(b"%PDF-1.4\n")
+    target.write(html_content.encode('utf-8'))
+
+
+_render_pdf = {
+    "weasyprint": _render_weasyprint,
+    "xhtml2pdf": _render_xhtml2pdf,
+}.get(PDF_BACKEND, _render_simulated)
+
+
+# Output buffer for PDF writes; large enough to take a typical report in one syscall
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Reports are served to other readers; mkstemp would otherwise leave them 0600
+_REPORT_FILE_MODE = 0o644
+
+# Upper bound on reports rendered concurrently by generate_all
+_MAX_REPORT_WORKERS = 8
+
+# Rough HTML characters per rendered page, for page count estimates
+_CHARS_PER_PAGE = 3000
+
+# Append-only JSON Lines index of generated reports, one PDFReport per line
+_INDEX_FILENAME = "_index.jsonl"
+
+# Report templates are defined once at import and filled with str.format.
+# Style blocks never change, so they are kept as plain constants and
+# spliced in between the formatted head and body (or, with WeasyPrint,
+# passed as pre-parsed stylesheets instead).
+_REPORT_HEAD_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
-    <title>{package.title}</title>
-    <style>
-        body {{
+    <title>{title}</title>
+"""
+
+_REPORT_CSS = """
+        body {
             font-family: Arial, sans-serif;
             margin: 40px;
             color: #333;
-        }}
-        .header {{
+        }
+        .header {
             border-bottom: 3px solid #0066cc;
             padding-bottom: 20px;
             margin-bottom: 30px;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             color: #0066cc;
             margin: 0;
-        }}
-        .section {{
+        }
+        .section {
             margin: 30px 0;
-        }}
-        .section h2 {{
+        }
+        .section h2 {
             color: #0066cc;
             border-bottom: 1px solid #ccc;
             padding-bottom: 10px;
-        }}
-        .metadata {{
+        }
+        .metadata {
             background: #f5f5f5;
             padding: 15px;
             border-radius: 5px;
             margin: 20px 0;
-        }}
-        .metadata-item {{
+        }
+        .metadata-item {
             margin: 10px 0;
-        }}
-        .metadata-label {{
+        }
+        .metadata-label {
             font-weight: bold;
             display: inline-block;
             width: 200px;
-        }}
-        .evidence-item, .proof-item {{
+        }
+        .evidence-item, .proof-item {
             background: #fafafa;
             padding: 15px;
             margin: 10px 0;
             border-left: 3px solid #0066cc;
-        }}
-        .footer {{
+        }
+        .footer {
             margin-top: 50px;
             padding-top: 20px;
             border-top: 1px solid #ccc;
             font-size: 12px;
             color: #666;
-        }}
-        .signature-box {{
+        }
+        .signature-box {
             border: 1px solid #ccc;
             padding: 20px;
             margin: 20px 0;
-        }}
-    </style>
-</head>
+        }
+    """
+
+_REPORT_STYLE = "    <style>" + _REPORT_CSS + "</style>\n"
+
+_REPORT_BODY_TEMPLATE = """</head>
 <body>
     <div class="header">
-        <h1>{package.title}</h1>
-        <p>{package.description}</p>
+        <h1>{title}</h1>
+        <p>{description}</p>
     </div>
     
     <div class="section">
@@ -245,31 +165,31 @@ class PDFGenerator:
         <div class="metadata">
             <div class="metadata-item">
                 <span class="metadata-label">Package ID:</span>
-                <span>{package.package_id}</span>
+                <span>{package_id}</span>
             </div>
             <div class="metadata-item">
                 <span class="metadata-label">Claim ID:</span>
-                <span>{package.claim_id}</span>
+                <span>{claim_id}</span>
             </div>
             <div class="metadata-item">
                 <span class="metadata-label">Attestation Type:</span>
-                <span>{package.attestation_type}</span>
+                <span>{attestation_type}</span>
             </div>
             <div class="metadata-item">
                 <span class="metadata-label">Status:</span>
-                <span>{package.status.value}</span>
+                <span>{status}</span>
             </div>
             <div class="metadata-item">
                 <span class="metadata-label">Compliance Framework:</span>
-                <span>{package.compliance_framework or 'N/A'}</span>
+                <span>{compliance_framework}</span>
             </div>
             <div class="metadata-item">
                 <span class="metadata-label">Valid From:</span>
-                <span>{package.valid_from.strftime('%Y-%m-%d')}</span>
+                <span>{valid_from}</span>
             </div>
             <div class="metadata-item">
                 <span class="metadata-label">Valid Until:</span>
-                <span>{package.valid_until.strftime('%Y-%m-%d') if package.valid_until else 'No expiration'}</span>
+                <span>{valid_until}</span>
             </div>
         </div>
     </div>
@@ -279,156 +199,198 @@ class PDFGenerator:
         <div class="metadata">
             <div class="metadata-item">
                 <span class="metadata-label">Name:</span>
-                <span>{package.issuer.get('name', 'N/A')}</span>
+                <span>{issuer_name}</span>
             </div>
             <div class="metadata-item">
                 <span class="metadata-label">Organization:</span>
-                <span>{package.issuer.get('organization', 'N/A')}</span>
+                <span>{issuer_organization}</span>
             </div>
             <div class="metadata-item">
                 <span class="metadata-label">Email:</span>
-                <span>{package.issuer.get('email', 'N/A')}</span>
+                <span>{issuer_email}</span>
             </div>
         </div>
     </div>
 """
-        
-        # Add evidence section
-        if include_evidence and package.evidence_bundles:
-            html += """
+
+_EVIDENCE_SECTION_OPEN = """
     <div class="section">
         <h2>Evidence Bundles</h2>
 """
-            for bundle in package.evidence_bundles:
-                html += f"""
-        <div class="evidence-item">
-            <p><strong>Bundle ID:</strong> {bundle['bundle_id']}</p>
-            <p><strong>Evidence Count:</strong> {bundle['evidence_count']}</p>
-            <p><strong>Merkle Root:</strong> {bundle['merkle_root'][:16]}...</p>
-            <p><strong>Created:</strong> {bundle.get('created_at', 'N/A')}</p>
-        </div>
-"""
-            html += "    </div>\n"
-        
-        # Add proofs section
-        if include_proofs and package.proofs:
-            html += """
+
+_PROOF_SECTION_OPEN = """
     <div class="section">
         <h2>Zero-Knowledge Proofs</h2>
 """
-            for proof in package.proofs:
-                html += f"""
+
+_SECTION_CLOSE = "    </div>\n"
+
+_EVIDENCE_ITEM_TEMPLATE = """
+        <div class="evidence-item">
+            <p><strong>Bundle ID:</strong> {bundle_id}</p>
+            <p><strong>Evidence Count:</strong> {evidence_count}</p>
+            <p><strong>Merkle Root:</strong> {merkle_root}...</p>
+            <p><strong>Created:</strong> {created_at}</p>
+        </div>
+"""
+
+_PROOF_ITEM_TEMPLATE = """
         <div class="proof-item">
-            <p><strong>Proof ID:</strong> {proof['proof_id']}</p>
-            <p><strong>Circuit Type:</strong> {proof['circuit_type']}</p>
-            <p><strong>Template:</strong> {proof['template_id']}</p>
-            <p><strong>Proof Hash:</strong> {proof['proof_hash'][:32]}...</p>
-            <p><strong>Proving Time:</strong> {proof['proving_time']:.2f}s</p>
+            <p><strong>Proof ID:</strong> {proof_id}</p>
+            <p><strong>Circuit Type:</strong> {circuit_type}</p>
+            <p><strong>Template:</strong> {template_id}</p>
+            <p><strong>Proof Hash:</strong> {proof_hash}...</p>
+            <p><strong>Proving Time:</strong> {proving_time:.2f}s</p>
         </div>
 """
-            html += "    </div>\n"
-        
-        # Add signature section
-        if package.signature:
-            html += f"""
+
+_SIGNATURE_SECTION_TEMPLATE = """
     <div class="section">
         <h2>Digital Signature</h2>
         <div class="signature-box">
-            <p><strong>Signature Algorithm:</strong> {package.signature_algorithm}</p>
-            <p><strong>Signature:</strong> {package.signature[:64]}...</p>
-            <p><strong>Signed At:</strong> {package.signed_at.strftime('%Y-%m-%d %H:%M:%S') if package.signed_at else 'N/A'}</p>
-            <p><strong>Package Hash:</strong> {package.package_hash}</p>
+            <p><strong>Signature Algorithm:</strong> {signature_algorithm}</p>
+            <p><strong>Signature:</strong> {signature}...</p>
+            <p><strong>Signed At:</strong> {signed_at}</p>
+            <p><strong>Package Hash:</strong> {package_hash}</p>
         </div>
     </div>
 """
-        
-        html += f"""
+
+_REPORT_FOOTER_TEMPLATE = """
     <div class="footer">
-        <p>Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
+        <p>Generated: {generated_at}</p>
         <p>ZKP Attestation Agent v1.0</p>
     </div>
 </body>
 </html>
 """
-        return html
-    
-    def _generate_executive_summary_html(self, package: AttestationPackage) -> str:
-        """Generate executive summary HTML"""
-        html = f"""
+
+_EXECUTIVE_SUMMARY_HEAD_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
-    <title>Executive Summary - {package.title}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; }}
-        .header {{ text-align: center; margin-bottom: 40px; }}
-        .summary-box {{ background: #f0f8ff; padding: 20px; border-radius: 5px; margin: 20px 0; }}
-        .stat {{ display: inline-block; margin: 15px 30px; text-align: center; }}
-        .stat-value {{ font-size: 32px; font-weight: bold; color: #0066cc; }}
-        .stat-label {{ font-size: 14px; color: #666; }}
-    </style>
-</head>
+    <title>Executive Summary - {title}</title>
+"""
+
+_EXECUTIVE_SUMMARY_CSS = """
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        .header { text-align: center; margin-bottom: 40px; }
+        .summary-box { background: #f0f8ff; padding: 20px; border-radius: 5px; margin: 20px 0; }
+        .stat { display: inline-block; margin: 15px 30px; text-align: center; }
+        .stat-value { font-size: 32px; font-weight: bold; color: #0066cc; }
+        .stat-label { font-size: 14px; color: #666; }
+    """
+
+_EXECUTIVE_SUMMARY_STYLE = "    <style>" + _EXECUTIVE_SUMMARY_CSS + "</style>\n"
+
+_EXECUTIVE_SUMMARY_BODY_TEMPLATE = """</head>
 <body>
     <div class="header">
         <h1>Executive Summary</h1>
-        <h2>{package.title}</h2>
+        <h2>{title}</h2>
     </div>
     
     <div class="summary-box">
         <h3>Attestation Overview</h3>
-        <p>{package.description}</p>
+        <p>{description}</p>
         
         <div style="text-align: center; margin: 30px 0;">
             <div class="stat">
-                <div class="stat-value">{len(package.evidence_bundles)}</div>
+                <div class="stat-value">{evidence_count}</div>
                 <div class="stat-label">Evidence Bundles</div>
             </div>
             <div class="stat">
-                <div class="stat-value">{len(package.proofs)}</div>
+                <div class="stat-value">{proof_count}</div>
                 <div class="stat-label">ZKP Proofs</div>
             </div>
             <div class="stat">
-                <div class="stat-value">{package.status.value.upper()}</div>
+                <div class="stat-value">{status}</div>
                 <div class="stat-label">Status</div>
             </div>
         </div>
         
-        <p><strong>Compliance Framework:</strong> {package.compliance_framework or 'Custom'}</p>
-        <p><strong>Valid Period:</strong> {package.valid_from.strftime('%Y-%m-%d')} to {package.valid_until.strftime('%Y-%m-%d') if package.valid_until else 'No expiration'}</p>
-        <p><strong>Issuer:</strong> {package.issuer.get('name', 'N/A')}</p>
+        <p><strong>Compliance Framework:</strong> {compliance_framework}</p>
+        <p><strong>Valid Period:</strong> {valid_from} to {valid_until}</p>
+        <p><strong>Issuer:</strong> {issuer_name}</p>
     </div>
 </body>
 </html>
 """
-        return html
-    
-    def _generate_compliance_html(self, package: AttestationPackage, framework: str) -> str:
-        """Generate compliance-specific HTML"""
-        html = f"""
+
+_COMPLIANCE_REPORT_HEAD_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
-    <title>{framework} Compliance Report - {package.title}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; }}
-        .header {{ border-bottom: 3px solid #0066cc; padding-bottom: 20px; }}
-        .control {{ background: #fafafa; padding: 15px; margin: 10px 0; border-left: 3px solid #28a745; }}
-    </style>
-</head>
+    <title>{framework} Compliance Report - {title}</title>
+"""
+
+_COMPLIANCE_REPORT_CSS = """
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        .header { border-bottom: 3px solid #0066cc; padding-bottom: 20px; }
+        .control { background: #fafafa; padding: 15px; margin: 10px 0; border-left: 3px solid #28a745; }
+    """
+
+_COMPLIANCE_REPORT_STYLE = "    <style>" + _COMPLIANCE_REPORT_CSS + "</style>\n"
+
+# Stylesheet per report kind, used for the inline <style> block or WeasyPrint CSS
+_REPORT_CSS_BY_KIND = {
+    "report": _REPORT_CSS,
+    "executive_summary": _EXECUTIVE_SUMMARY_CSS,
+    "compliance": _COMPLIANCE_REPORT_CSS,
+}
+_STYLE_BLOCK_BY_KIND = {
+    "report": _REPORT_STYLE,
+    "executive_summary": _EXECUTIVE_SUMMARY_STYLE,
+    "compliance": _COMPLIANCE_REPORT_STYLE,
+}
+
+# WeasyPrint font configuration and parsed stylesheets, shared by every
+# generator in the process; built on first use under the lock
+_WEASYPRINT_LOCK = threading.Lock()
+_weasyprint_state: Optional[Tuple[Any, Optional[Dict[str, Any]]]] = None
+
+
+def _weasyprint_resources() -> Tuple[Any, Optional[Dict[str, Any]]]:
+    """
+    Return the shared WeasyPrint (font_config, stylesheets)
+    
+    Fonts are configured and the report stylesheets parsed once per
+    process. stylesheets is None when setup failed, in which case
+    callers fall back to simulated output.
+    """
+    global _weasyprint_state
+    state = _weasyprint_state
+    if state is None:
+        with _WEASYPRINT_LOCK:
+            state = _weasyprint_state
+            if state is None:
+                try:
+                    font_config = FontConfiguration() if FontConfiguration else None
+                    state = (font_config, {
+                        kind: CSS(string=css, font_config=font_config)
+                        for kind, css in _REPORT_CSS_BY_KIND.items()
+                    })
+                except Exception as e:
+                    logger.warning(f"WeasyPrint stylesheet setup failed: {e}. Using simulated PDF output.")
+                    state = (None, None)
+                _weasyprint_state = state
+    return state
+
+_COMPLIANCE_REPORT_BODY_TEMPLATE = """</head>
 <body>
     <div class="header">
         <h1>{framework} Compliance Report</h1>
-        <h2>{package.title}</h2>
+        <h2>{title}</h2>
     </div>
     
     <div class="section">
         <h2>Compliance Summary</h2>
         <p>This report demonstrates compliance with {framework} requirements through zero-knowledge proofs.</p>
-        <p><strong>Assessment Date:</strong> {package.assessment_date.strftime('%Y-%m-%d')}</p>
-        <p><strong>Evidence Bundles:</strong> {len(package.evidence_bundles)}</p>
-        <p><strong>ZKP Proofs:</strong> {len(package.proofs)}</p>
+        <p><strong>Assessment Date:</strong> {assessment_date}</p>
+        <p><strong>Evidence Bundles:</strong> {evidence_count}</p>
+        <p><strong>ZKP Proofs:</strong> {proof_count}</p>
     </div>
     
     <div class="section">
@@ -438,46 +400,588 @@ class PDFGenerator:
 </body>
 </html>
 """
-        return html
+
+
+def _now_str(now: Optional[datetime] = None) -> str:
+    """UTC time (current unless given) formatted for report footers"""
+    # isoformat slicing avoids strftime's per-call format parsing
+    return (now or datetime.utcnow()).isoformat(sep=' ', timespec='seconds')[:19] + ' UTC'
+
+
+class PDFReport(BaseModel):
+    """
+    PDF report metadata
+    """
+    report_id: str = Field(..., description="Report identifier")
+    package_id: str = Field(..., description="Associated package ID")
+    file_path: str = Field(..., description="Path to PDF file")
+    file_size: int = Field(..., description="File size in bytes")
+    page_count: int = Field(..., description="Number of pages")
+    generated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class PDFGenerator:
+    """
+    Generates PDF reports from attestation packages
     
-    def _html_to_pdf(self, html_content: str) -> bytes:
+    Rendering uses WeasyPrint or xhtml2pdf when installed; without either,
+    output is simulated (HTML behind a PDF header).
+    """
+    
+    def __init__(self, output_path: Optional[Path] = None):
         """
-        Convert HTML to PDF
+        Initialize PDF generator
         
-        In production, use libraries like:
-        - WeasyPrint: weasyprint.HTML(string=html_content).write_pdf()
-        - xhtml2pdf: pisa.CreatePDF(html_content)
-        - ReportLab: Build PDF from scratch
+        Args:
+            output_path: Path for PDF outputs
+        """
+        self.output_path = output_path or Path("./exports/pdf")
+        self.output_path.mkdir(parents=True, exist_ok=True)
+        
+        # Report paths are built as plain strings; open() and PDFReport take str directly
+        self._output_str = os.fspath(self.output_path)
+        self._index_str = os.path.join(self._output_str, _INDEX_FILENAME)
+        
+        # Serializes appends to the report index across generate_all workers
+        self._index_lock = threading.Lock()
         
-        For now, simulate PDF generation
+        # file_path -> latest indexed report, loaded from the index on first use
+        self._reports_by_path: Optional[Dict[str, PDFReport]] = None
+        
+        # Renderer chosen at import; WeasyPrint fonts and stylesheets come
+        # from the process-wide cache rather than being rebuilt per generator
+        self._render = _render_pdf
+        self._font_config = None
+        self._stylesheets: Optional[Dict[str, Any]] = None
+        if self._render is _render_weasyprint:
+            self._font_config, self._stylesheets = _weasyprint_resources()
+            if self._stylesheets is None:
+                self._render = _render_simulated
+    
+    def generate_attestation_report(
+        self,
+        package: AttestationPackage,
+        include_evidence: bool = True,
+        include_proofs: bool = True,
+        template: str = "standard"
+    ) -> PDFReport:
+        """
+        Generate PDF attestation report
+        
+        Assembled packages are rendered at most once per distinct content
+        and options: the file name carries an options key and a render key,
+        and an existing report for the same keys is returned without
+        regenerating it. Reports for the same options left over from
+        earlier package content are removed when a new one is written.
+        
+        Args:
+            package: Attestation package
+            include_evidence: Include evidence details
+            include_proofs: Include proof details
+            template: Report template to use
+        
+        Returns:
+            PDFReport metadata
         """
-        # Simulate PDF by storing HTML as bytes
+        # Generate PDF filename
+        render_key = self._render_key(package)
+        if render_key:
+            options_prefix = (
+                f"{package.package_id}_report_"
+                f"{self._options_key(include_evidence, include_proofs, template)}_"
+            )
+            filename = f"{options_prefix}{render_key}.pdf"
+        else:
+            filename = f"{package.package_id}_report.pdf"
+        file_path = f"{self._output_str}{os.sep}{filename}"
+        
+        if render_key:
+            cached = self._find_report(file_path)
+            if cached is not None and os.path.exists(file_path):
+                return cached
+        
+        # One clock read serves both the footer and the report metadata
+        now = datetime.utcnow()
+        
+        # Generate HTML content
+        html_content = self._generate_html(
+            package,
+            include_evidence=include_evidence,
+            include_proofs=include_proofs,
+            template=template,
+            now_str=_now_str(now)
+        )
+        html_len = len(html_content)
+        
+        # Convert HTML to PDF (simulated) and stream it to disk
         # In production, use actual PDF library
-        pdf_header = b"%PDF-1.4\n"
-        pdf_content = html_content.encode('utf-8')
-        return pdf_header + pdf_content
+        file_size = self._write_pdf(file_path, html_content, "report")
+        
+        if render_key:
+            self._remove_stale_reports(options_prefix, filename)
+        
+        # Create and record report metadata
+        return self._build_report(
+            report_id=f"report_{package.package_id}",
+            package_id=package.package_id,
+            file_path=file_path,
+            file_size=file_size,
+            page_count=self._estimate_page_count(html_len),
+            generated_at=now
+        )
+    
+    def generate_executive_summary(
+        self,
+        package: AttestationPackage
+    ) -> PDFReport:
+        """
+        Generate executive summary PDF
+        
+        Args:
+            package: Attestation package
+        
+        Returns:
+            PDFReport metadata
+        """
+        html_content = self._generate_executive_summary_html(package)
+        
+        filename = f"{package.package_id}_executive_summary.pdf"
+        file_path = f"{self._output_str}{os.sep}{filename}"
+        
+        file_size = self._write_pdf(file_path, html_content, "executive_summary")
+        
+        return self._build_report(
+            report_id=f"summary_{package.package_id}",
+            package_id=package.package_id,
+            file_path=file_path,
+            file_size=file_size,
+            page_count=1
+        )
+    
+    def generate_compliance_report(
+        self,
+        package: AttestationPackage,
+        framework: str
+    ) -> PDFReport:
+        """
+        Generate framework-specific compliance report
+        
+        Args:
+            package: Attestation package
+            framework: Compliance framework (SOC2, ISO27001, etc.)
+        
+        Returns:
+            PDFReport metadata
+        """
+        html_content = self._generate_compliance_html(package, framework)
+        
+        filename = f"{package.package_id}_{framework}_compliance.pdf"
+        file_path = f"{self._output_str}{os.sep}{filename}"
+        
+        file_size = self._write_pdf(file_path, html_content, "compliance")
+        
+        return self._build_report(
+            report_id=f"compliance_{package.package_id}_{framework}",
+            package_id=package.package_id,
+            file_path=file_path,
+            file_size=file_size,
+            page_count=self._estimate_page_count(len(html_content))
+        )
+    
+    def generate_all(
+        self,
+        package: AttestationPackage,
+        frameworks: Optional[List[str]] = None
+    ) -> List[PDFReport]:
+        """
+        Generate the full report, executive summary and compliance reports
+        
+        Reports are rendered and written concurrently; file writes and large
+        string encodes release the GIL.
+        
+        Args:
+            package: Attestation package
+            frameworks: Compliance frameworks to report on (defaults to the
+                package's compliance framework, if any)
+        
+        Returns:
+            PDFReport metadata, full report first, then summary, then one per framework
+        """
+        if frameworks is None:
+            frameworks = [package.compliance_framework] if package.compliance_framework else []
+        
+        tasks = [
+            (self.generate_attestation_report, (package,)),
+            (self.generate_executive_summary, (package,)),
+        ]
+        tasks.extend((self.generate_compliance_report, (package, framework)) for framework in frameworks)
+        
+        max_workers = min(_MAX_REPORT_WORKERS, os.cpu_count() or 1, len(tasks))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(func, *args) for func, args in tasks]
+            return [future.result() for future in futures]
+    
+    def _generate_html(
+        self,
+        package: AttestationPackage,
+        include_evidence: bool,
+        include_proofs: bool,
+        template: str,
+        now_str: Optional[str] = None
+    ) -> str:
+        """
+        Generate HTML content for PDF
+        
+        Args:
+            package: Attestation package
+            include_evidence: Include evidence details
+            include_proofs: Include proof details
+            template: Report template to use
+            now_str: Pre-formatted generation timestamp, shared when several
+                reports are rendered for one request
+        
+        Returns:
+            Report HTML
+        """
+        # User-supplied text is escaped once and reused wherever it appears
+        title = escape(package.title)
+        
+        # Collect fragments and join once; repeated += is quadratic for large packages
+        parts = [
+            _REPORT_HEAD_TEMPLATE.format(title=title),
+            self._style_block("report"),
+            _REPORT_BODY_TEMPLATE.format(
+                title=title,
+                description=escape(package.description),
+                package_id=escape(package.package_id),
+                claim_id=escape(package.claim_id),
+                attestation_type=escape(package.attestation_type),
+                status=package.status.value,
+                compliance_framework=escape(package.compliance_framework or 'N/A'),
+                valid_from=package.valid_from.isoformat()[:10],
+                valid_until=package.valid_until.isoformat()[:10] if package.valid_until else 'No expiration',
+                issuer_name=escape(package.issuer.get('name', 'N/A')),
+                issuer_organization=escape(package.issuer.get('organization', 'N/A')),
+                issuer_email=escape(package.issuer.get('email', 'N/A'))
+            )
+        ]
+        
+        # Add evidence section
+        if include_evidence and package.evidence_bundles:
+            format_item = _EVIDENCE_ITEM_TEMPLATE.format
+            parts.append(_EVIDENCE_SECTION_OPEN)
+            parts.append("".join(
+                format_item(
+                    bundle_id=escape(bundle['bundle_id']),
+                    evidence_count=bundle['evidence_count'],
+                    merkle_root=bundle['merkle_root'][:16],
+                    created_at=escape(str(bundle.get('created_at', 'N/A')))
+                )
+                for bundle in package.evidence_bundles
+            ))
+            parts.append(_SECTION_CLOSE)
+        
+        # Add proofs section
+        if include_proofs and package.proofs:
+            format_item = _PROOF_ITEM_TEMPLATE.format
+            parts.append(_PROOF_SECTION_OPEN)
+            parts.append("".join(
+                format_item(
+                    proof_id=escape(proof['proof_id']),
+                    circuit_type=escape(proof['circuit_type']),
+                    template_id=escape(proof['template_id']),
+                    proof_hash=proof['proof_hash'][:32],
+                    proving_time=proof['proving_time']
+                )
+                for proof in package.proofs
+            ))
+            parts.append(_SECTION_CLOSE)
+        
+        # Add signature section
+        if package.signature:
+            parts.append(_SIGNATURE_SECTION_TEMPLATE.format(
+                signature_algorithm=escape(str(package.signature_algorithm)),
+                signature=package.signature[:64],
+                signed_at=package.signed_at.isoformat(sep=' ', timespec='seconds')[:19] if package.signed_at else 'N/A',
+                package_hash=package.package_hash
+            ))
+        
+        parts.append(_REPORT_FOOTER_TEMPLATE.format(
+            generated_at=now_str or _now_str()
+        ))
+        return "".join(parts)
+    
+    def _generate_executive_summary_html(self, package: AttestationPackage) -> str:
+        """Generate executive summary HTML"""
+        title = escape(package.title)
+        html = (
+            _EXECUTIVE_SUMMARY_HEAD_TEMPLATE.format(title=title)
+            + self._style_block("executive_summary")
+            + _EXECUTIVE_SUMMARY_BODY_TEMPLATE.format(
+                title=title,
+                description=escape(package.description),
+                evidence_count=len(package.evidence_bundles),
+                proof_count=len(package.proofs),
+                status=package.status.value.upper(),
+                compliance_framework=escape(package.compliance_framework or 'Custom'),
+                valid_from=package.valid_from.isoformat()[:10],
+                valid_until=package.valid_until.isoformat()[:10] if package.valid_until else 'No expiration',
+                issuer_name=escape(package.issuer.get('name', 'N/A'))
+            )
+        )
+        return html
+    
+    def _generate_compliance_html(self, package: AttestationPackage, framework: str) -> str:
+        """Generate compliance-specific HTML"""
+        framework_text = escape(framework)
+        title = escape(package.title)
+        html = (
+            _COMPLIANCE_REPORT_HEAD_TEMPLATE.format(framework=framework_text, title=title)
+            + self._style_block("compliance")
+            + _COMPLIANCE_REPORT_BODY_TEMPLATE.format(
+                framework=framework_text,
+                title=title,
+                assessment_date=package.assessment_date.isoformat()[:10],
+                evidence_count=len(package.evidence_bundles),
+                proof_count=len(package.proofs)
+            )
+        )
+        return html
+    
+    def _style_block(self, kind: str) -> str:
+        """Inline <style> block for a report kind; empty when WeasyPrint applies the CSS"""
+        return "" if self._stylesheets else _STYLE_BLOCK_BY_KIND[kind]
+    
+    def _write_pdf(self, file_path: str, html_content: str, kind: str) -> int:
+        """
+        Render HTML to PDF directly into a file
+        
+        The PDF is written to a temporary file, fsynced and then renamed into
+        place, so readers never observe a partially written report.
+        
+        Args:
+            file_path: Destination PDF path
+            html_content: HTML to render
+            kind: Report kind, selecting the stylesheet
+        
+        Returns:
+            Number of bytes written
+        """
+        # Unique temp name in the destination directory, so concurrent
+        # threads and processes never share one and the rename stays atomic
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(file_path) or ".",
+            prefix=os.path.basename(file_path) + ".",
+            suffix=".tmp"
+        )
+        try:
+            with open(fd, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+                self._html_to_pdf(html_content, f, kind)
+                file_size = f.tell()
+                f.flush()
+                os.fchmod(f.fileno(), _REPORT_FILE_MODE)
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        
+        return file_size
+    
+    def _html_to_pdf(self, html_content: str, target: BinaryIO, kind: str = "report"):
+        """
+        Convert HTML to PDF, writing the output to target
+        
+        Dispatches to the renderer selected at import (see PDF_BACKEND).
+        Output is written straight to the target so no full-document bytes
+        object is kept in memory.
+        
+        Args:
+            html_content: HTML to render
+            target: Binary file object to write the PDF to
+            kind: Report kind, selecting the stylesheet
+        """
+        stylesheet = self._stylesheets[kind] if self._stylesheets else None
+        self._render(html_content, target, stylesheet, self._font_config)
     
-    def _estimate_page_count(self, html_content: str) -> int:
-        """Estimate PDF page count from HTML length"""
-        # Rough estimate: 3000 characters per page
-        char_count = len(html_content)
-        return max(1, (char_count // 3000) + 1)
+    def _estimate_page_count(self, char_count: int) -> int:
+        """Estimate PDF page count from HTML length in characters"""
+        # Rough estimate: 3000 characters per page; always at least one page
+        return char_count // _CHARS_PER_PAGE + 1
     
     def get_report_path(self, report: PDFReport) -> Path:
         """Get path to PDF report file"""
         return Path(report.file_path)
     
+    @staticmethod
+    def _options_key(include_evidence: bool, include_proofs: bool, template: str) -> str:
+        """Compute a short key identifying full report render options"""
+        material = orjson.dumps([include_evidence, include_proofs, template])
+        return hashlib.blake2b(material, digest_size=4).hexdigest()
+    
+    def _render_key(self, package: AttestationPackage) -> Optional[str]:
+        """
+        Compute a key identifying the rendered package content of a full report
+        
+        package_hash covers claim, evidence and proof content; the other
+        rendered fields are hashed alongside it. Render options are keyed
+        separately by _options_key(). The generation timestamp in the
+        footer is deliberately excluded.
+        
+        Returns:
+            Hex key, or None for packages that have not been assembled yet
+        """
+        if not package.package_hash:
+            return None
+        
+        material = orjson.dumps(
+            [
+                package.package_hash,
+                package.title,
+                package.description,
+                package.attestation_type,
+                package.status.value,
+                package.compliance_framework,
+                package.issuer,
+                package.valid_from,
+                package.valid_until,
+                package.signature,
+                package.signature_algorithm,
+                package.signed_at,
+                self._render.__name__,
+            ],
+            option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.blake2b(material, digest_size=16).hexdigest()
+    
+    def _build_report(
+        self,
+        report_id: str,
+        package_id: str,
+        file_path: str,
+        file_size: int,
+        page_count: int,
+        generated_at: Optional[datetime] = None
+    ) -> PDFReport:
+        """
+        Create report metadata and append it to the report index
+        
+        All fields are produced by this generator, so pydantic validation is
+        skipped.
+        
+        Args:
+            report_id: Report identifier
+            package_id: Associated package ID
+            file_path: Path of the written PDF
+            file_size: PDF size in bytes
+            page_count: Estimated page count
+            generated_at: Generation time (defaults to now)
+        
+        Returns:
+            PDFReport metadata
+        """
+        report = PDFReport.model_construct(
+            report_id=report_id,
+            package_id=package_id,
+            file_path=file_path,
+            file_size=file_size,
+            page_count=page_count,
+            generated_at=generated_at or datetime.utcnow()
+        )
+        self._record_report(report)
+        return report
+    
+    def _record_report(self, report: PDFReport):
+        """Append report metadata to the report index"""
+        # orjson encodes datetimes as ISO 8601 natively and returns bytes
+        line = orjson.dumps(report.model_dump()) + b"\n"
+        with self._index_lock:
+            with open(self._index_str, "ab") as f:
+                f.write(line)
+            if self._reports_by_path is not None:
+                self._reports_by_path[report.file_path] = report
+    
+    def _remove_stale_reports(self, options_prefix: str, keep_filename: str):
+        """Delete full reports with the same package and options but older content"""
+        with os.scandir(self._output_str) as entries:
+            stale = [
+                entry.path for entry in entries
+                if entry.name.startswith(options_prefix)
+                and entry.name.endswith(".pdf")
+                and entry.name != keep_filename
+            ]
+        
+        with self._index_lock:
+            for path in stale:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                if self._reports_by_path is not None:
+                    self._reports_by_path.pop(path, None)
+    
+    @staticmethod
+    def _report_from_data(data: Dict[str, Any]) -> PDFReport:
+        """Build a PDFReport from stored metadata written by this generator"""
+        data["generated_at"] = datetime.fromisoformat(data["generated_at"])
+        return PDFReport.model_construct(**data)
+    
+    def _read_index(self) -> List[PDFReport]:
+        """Read every readable entry from the report index, oldest first"""
+        reports = []
+        
+        try:
+            with open(self._index_str, "rb") as f:
+                for line in f:
+                    try:
+                        reports.append(self._report_from_data(orjson.loads(line)))
+                    except Exception:
+                        continue
+        except FileNotFoundError:
+            pass
+        
+        return reports
+    
+    def _find_report(self, file_path: str) -> Optional[PDFReport]:
+        """Get the most recent indexed report written to file_path"""
+        with self._index_lock:
+            if self._reports_by_path is None:
+                self._reports_by_path = {report.file_path: report for report in self._read_index()}
+            return self._reports_by_path.get(file_path)
+    
     def list_reports(self) -> List[PDFReport]:
-        """List all generated reports"""
+        """
+        List all generated reports
+        
+        Reads the report index in one pass; a regenerated report replaces
+        its earlier entry. Directories written before the index existed
+        fall back to scanning for per-PDF metadata sidecars.
+        """
+        if os.path.exists(self._index_str):
+            reports_by_id: Dict[str, PDFReport] = {}
+            for report in self._read_index():
+                reports_by_id[report.report_id] = report
+            return list(reports_by_id.values())
+        
         reports = []
         
-        for pdf_file in self.output_path.glob("*.pdf"):
+        # One directory scan; sidecar existence is a set lookup rather than a stat per PDF
+        with os.scandir(self._output_str) as entries:
+            names = {entry.name for entry in entries if entry.is_file()}
+        
+        for name in names:
+            if not name.endswith(".pdf"):
+                continue
+            
             # Try to load metadata if exists
-            metadata_file = pdf_file.with_suffix('.json')
-            if metadata_file.exists():
+            metadata_name = name[:-4] + ".json"
+            if metadata_name in names:
                 try:
-                    report = PDFReport.parse_raw(metadata_file.read_text())
-                    reports.append(report)
+                    with open(os.path.join(self._output_str, metadata_name), "rb") as f:
+                        reports.append(self._report_from_data(orjson.loads(f.read())))
                 except:
                     pass
         
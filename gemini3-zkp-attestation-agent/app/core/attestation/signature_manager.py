@@ -3,19 +3,60 @@ Digital Signature Manager
 Manages digital signatures for attestation packages
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple, Annotated
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from pydantic import BaseModel, Field
-import json
-import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pydantic import BaseModel, BeforeValidator, Field, PlainSerializer
+import base64
+import gzip
+import hmac
+import os
+import secrets
+import orjson
+from hashlib import sha256 as _sha256
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, ec, ed25519, rsa
 
 from app.core.attestation.package_builder import AttestationPackage
-from app.utils.crypto import HashUtils
 from app.utils.errors import ValidationError, SignatureError
 
 
+# Signature parameters are immutable; build them once
+_SHA256 = hashes.SHA256()
+_RSA_PADDING = padding.PKCS1v15()
+_ECDSA_SHA256 = ec.ECDSA(_SHA256)
+
+# Signature records are only read back by this service
+_SIGNATURE_FILE_MODE = 0o600
+
+# Random bytes in a signature ID, and how many fresh IDs to try when a new
+# record's file already exists
+_SIGNATURE_ID_BYTES = 8
+_SIGNATURE_ID_ATTEMPTS = 5
+
+# Signature records are compact JSON, gzipped at a fast level; plain .json
+# records written by earlier versions are still read
+_SIGNATURE_SUFFIX = ".json.gz"
+_LEGACY_SIGNATURE_SUFFIX = ".json"
+_SIGNATURE_COMPRESS_LEVEL = 1
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Fields returned by load_signature_header
+_SIGNATURE_HEADER_FIELDS = ("signature_id", "package_id", "algorithm", "is_valid")
+
+# PEM armor for exported public keys (base64 body wrapped at 64 columns)
+_PEM_HEADER = b"-----BEGIN PUBLIC KEY-----\n"
+_PEM_FOOTER = b"\n-----END PUBLIC KEY-----\n"
+_PEM_LINE_LENGTH = 64
+
+# Upper bound on verification jobs sent to a worker process per round trip
+_MAX_VERIFY_CHUNK_SIZE = 32
+
+
 class SignatureAlgorithm(str, Enum):
     """Supported signature algorithms"""
     RSA_SHA256 = "RSA-SHA256"
@@ -31,6 +72,34 @@ class KeyType(str, Enum):
     ED25519 = "Ed25519"
 
 
+# Key type generated when signing without a supplied private key
+_DEFAULT_KEY_TYPES = {
+    SignatureAlgorithm.RSA_SHA256: KeyType.RSA_2048,
+    SignatureAlgorithm.ECDSA_SHA256: KeyType.ECDSA_P256,
+    SignatureAlgorithm.ED25519: KeyType.ED25519,
+}
+
+
+def _hex_to_bytes(value: Any) -> Any:
+    """Decode hex strings (the stored and API representation) to bytes"""
+    if isinstance(value, str):
+        return bytes.fromhex(value)
+    return value
+
+
+def _bytes_to_hex(value: bytes) -> str:
+    """Encode bytes as hex for JSON/dict output"""
+    return value.hex()
+
+
+# Binary value held as bytes in memory and exchanged as hex in JSON/dicts
+_HexBytes = Annotated[
+    bytes,
+    BeforeValidator(_hex_to_bytes),
+    PlainSerializer(_bytes_to_hex, return_type=str),
+]
+
+
 class DigitalSignature(BaseModel):
     """
     Digital signature for attestation package
@@ -38,8 +107,8 @@ class DigitalSignature(BaseModel):
     signature_id: str = Field(..., description="Signature identifier")
     package_id: str = Field(..., description="Signed package ID")
     algorithm: SignatureAlgorithm = Field(..., description="Signature algorithm")
-    signature_value: str = Field(..., description="Signature value (hex)")
-    public_key: str = Field(..., description="Public key (PEM or hex)")
+    signature_value: _HexBytes = Field(..., description="Signature value (hex)")
+    public_key: _HexBytes = Field(..., description="Public key (hex SubjectPublicKeyInfo DER)")
     certificate: Optional[str] = Field(None, description="X.509 certificate (PEM)")
     
     # Signature metadata
@@ -48,25 +117,61 @@ class DigitalSignature(BaseModel):
     signer_email: Optional[str] = Field(None, description="Signer email")
     
     # Signed content
-    package_hash: str = Field(..., description="Hash of signed package")
+    package_hash: _HexBytes = Field(..., description="Hash of signed package (hex)")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     
     # Verification
     is_valid: Optional[bool] = Field(None, description="Signature verification status")
     verified_at: Optional[datetime] = Field(None, description="Verification timestamp")
+
+
+class SignerView(BaseModel):
+    """Signer section of a signature summary"""
+    id: str
+    name: str
+    email: Optional[str] = None
+
+
+class SignatureInfoView(BaseModel):
+    """
+    Signature summary returned by SignatureManager.get_signature_info
+    """
+    signature_id: str
+    package_id: str
+    algorithm: SignatureAlgorithm
+    signer: SignerView
+    timestamp: datetime
+    is_valid: Optional[bool] = None
+    verified_at: Optional[datetime] = None
+    package_hash: _HexBytes
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    @classmethod
+    def from_signature(cls, signature: DigitalSignature) -> "SignatureInfoView":
+        """Build view from an already-validated signature (no re-validation)"""
+        return cls.model_construct(
+            signature_id=signature.signature_id,
+            package_id=signature.package_id,
+            algorithm=signature.algorithm,
+            signer=SignerView.model_construct(
+                id=signature.signer_id,
+                name=signature.signer_name,
+                email=signature.signer_email
+            ),
+            timestamp=signature.timestamp,
+            is_valid=signature.is_valid,
+            verified_at=signature.verified_at,
+            package_hash=signature.package_hash
+        )
 
 
 class SignatureManager:
     """
     Manages digital signatures for attestation packages
     
-    Note: This is a simplified implementation. In production, use:
-    - cryptography library for real signatures
+    Keys are exchanged as hex-encoded DER (PKCS#8 private keys,
+    SubjectPublicKeyInfo public keys); PEM input is also accepted.
+    
+    Note: In production, also consider:
     - Hardware Security Modules (HSM)
     - Key Management Services (KMS)
     - X.509 certificate chains
@@ -81,7 +186,7 @@ class SignatureManager:
         """
         self.keys_path = keys_path or Path("./keys")
         self.keys_path.mkdir(parents=True, exist_ok=True)
-        self.hash_utils = HashUtils()
+        self._keys_str = os.fspath(self.keys_path)
     
     def sign_package(
         self,
@@ -109,23 +214,100 @@ class SignatureManager:
         Raises:
             SignatureError: If signing fails
         """
-        # Compute package hash
-        package_hash = package.compute_hash()
+        # Package hash (reused from assembly/validation when content is
+        # unchanged); the raw digest is what gets signed
+        package_digest = package.content_digest()
         
         # Generate or load key pair
         if not private_key:
-            private_key, public_key = self._generate_key_pair(algorithm)
-        else:
-            public_key = self._extract_public_key(private_key, algorithm)
+            private_key, _ = self._generate_key_pair(algorithm)
+        try:
+            key = self._load_private_key(private_key)
+        except Exception as e:
+            raise SignatureError(f"Failed to load private key: {e}")
+        public_key = self._public_key_der(key.public_key())
         
         # Sign package hash
         try:
-            signature_value = self._sign_data(package_hash, private_key, algorithm)
+            signature_value = self._sign_digest(package_digest, key, algorithm)
         except Exception as e:
             raise SignatureError(f"Failed to sign package: {e}")
         
-        # Create signature object
-        signature_id = self._generate_signature_id(package.package_id)
+        return self._record_signature(
+            package, package_digest, signature_value, public_key,
+            algorithm, signer_id, signer_name, signer_email
+        )
+    
+    def sign_packages(
+        self,
+        packages: List[AttestationPackage],
+        signer_id: str,
+        signer_name: str,
+        algorithm: SignatureAlgorithm = SignatureAlgorithm.RSA_SHA256,
+        private_key: Optional[str] = None,
+        signer_email: Optional[str] = None
+    ) -> List[DigitalSignature]:
+        """
+        Sign several attestation packages with one key
+        
+        The key pair is generated (or the supplied key parsed) once for the
+        whole batch; per package only the digest and signature are computed.
+        
+        Args:
+            packages: Attestation packages to sign
+            signer_id: Signer identifier
+            signer_name: Signer name
+            algorithm: Signature algorithm
+            private_key: Private key (PEM or hex)
+            signer_email: Signer email
+        
+        Returns:
+            DigitalSignature per package, in input order
+        
+        Raises:
+            SignatureError: If signing fails
+        """
+        if not packages:
+            return []
+        
+        # Generate or load key pair once for the batch
+        if not private_key:
+            private_key, _ = self._generate_key_pair(algorithm)
+        try:
+            key = self._load_private_key(private_key)
+        except Exception as e:
+            raise SignatureError(f"Failed to load private key: {e}")
+        public_key = self._public_key_der(key.public_key())
+        
+        signatures = []
+        for package in packages:
+            package_digest = package.content_digest()
+            
+            try:
+                signature_value = self._sign_digest(package_digest, key, algorithm)
+            except Exception as e:
+                raise SignatureError(f"Failed to sign package {package.package_id}: {e}")
+            
+            signatures.append(self._record_signature(
+                package, package_digest, signature_value, public_key,
+                algorithm, signer_id, signer_name, signer_email
+            ))
+        
+        return signatures
+    
+    def _record_signature(
+        self,
+        package: AttestationPackage,
+        package_hash: bytes,
+        signature_value: bytes,
+        public_key: bytes,
+        algorithm: SignatureAlgorithm,
+        signer_id: str,
+        signer_name: str,
+        signer_email: Optional[str]
+    ) -> DigitalSignature:
+        """Create signature object, attach it to the package and store it"""
+        signature_id = self._generate_signature_id()
         
         signature = DigitalSignature(
             signature_id=signature_id,
@@ -140,7 +322,7 @@ class SignatureManager:
         )
         
         # Update package with signature
-        package.signature = signature_value
+        package.signature = signature_value.hex()
         package.signature_algorithm = algorithm.value
         package.signed_at = datetime.utcnow()
         
@@ -167,9 +349,8 @@ class SignatureManager:
         Raises:
             SignatureError: If verification fails
         """
-        # Verify package hash matches
-        current_hash = package.compute_hash()
-        if current_hash != signature.package_hash:
+        # Verify package hash matches; raw digests are compared in constant time
+        if not hmac.compare_digest(package.compute_digest(), signature.package_hash):
             raise SignatureError("Package hash mismatch - content has been modified")
         
         # Verify signature
@@ -189,6 +370,50 @@ class SignatureManager:
         
         return is_valid
     
+    def verify_signatures(
+        self,
+        pairs: List[Tuple[AttestationPackage, DigitalSignature]],
+        max_workers: Optional[int] = None
+    ) -> List[bool]:
+        """
+        Verify many package signatures across worker processes
+        
+        Package hashing and the public-key check both run in the workers.
+        Unlike verify_signature, a package whose content no longer matches
+        the signed hash (or an unusable key) yields False instead of raising.
+        
+        Args:
+            pairs: (package, signature) pairs to verify
+            max_workers: Worker processes (defaults to the CPU count)
+        
+        Returns:
+            Verification result per pair, in input order
+        """
+        if not pairs:
+            return []
+        
+        jobs = [
+            (package, signature.package_hash, signature.signature_value,
+             signature.public_key, signature.algorithm)
+            for package, signature in pairs
+        ]
+        
+        workers = max_workers or os.cpu_count() or 1
+        if len(jobs) == 1 or workers == 1:
+            results = [_verify_job(job) for job in jobs]
+        else:
+            chunksize = max(1, min(_MAX_VERIFY_CHUNK_SIZE, len(jobs) // workers))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_verify_job, jobs, chunksize=chunksize))
+        
+        # Update signature verification status
+        verified_at = datetime.utcnow()
+        for (_, signature), is_valid in zip(pairs, results):
+            signature.is_valid = is_valid
+            signature.verified_at = verified_at
+        
+        return results
+    
     def add_countersignature(
         self,
         package: AttestationPackage,
@@ -210,22 +435,29 @@ class SignatureManager:
         Returns:
             Countersignature
         """
-        # Sign both package and original signature
-        combined_data = f"{package.package_hash}:{original_signature.signature_value}"
-        combined_hash = self.hash_utils.sha256(combined_data.encode())
+        if not package.package_hash:
+            raise ValidationError("Package must be assembled before countersigning")
         
-        private_key, public_key = self._generate_key_pair(algorithm)
-        signature_value = self._sign_data(combined_hash, private_key, algorithm)
+        # Sign both package and original signature: sha256("<package_hash>:<signature>"),
+        # fed incrementally instead of building the joined string
+        digest = _sha256(package.package_hash.encode())
+        digest.update(b":")
+        digest.update(original_signature.signature_value.hex().encode())
+        combined_digest = digest.digest()
+        
+        private_key, _ = self._generate_key_pair(algorithm)
+        key = self._load_private_key(private_key)
+        signature_value = self._sign_digest(combined_digest, key, algorithm)
         
         countersignature = DigitalSignature(
-            signature_id=self._generate_signature_id(package.package_id, suffix="counter"),
+            signature_id=self._generate_signature_id(),
             package_id=package.package_id,
             algorithm=algorithm,
             signature_value=signature_value,
-            public_key=public_key,
+            public_key=self._public_key_der(key.public_key()),
             signer_id=countersigner_id,
             signer_name=countersigner_name,
-            package_hash=combined_hash
+            package_hash=combined_digest
         )
         
         return countersignature
@@ -269,104 +501,237 @@ Public Key: {public_key[:32]}...
         }
     
     def _generate_key_pair(self, algorithm: SignatureAlgorithm) -> tuple[str, str]:
-        """Generate key pair for algorithm"""
-        # In production, use cryptography library
-        # For now, simulate key generation
-        
-        import secrets
-        
-        if algorithm == SignatureAlgorithm.RSA_SHA256:
-            private_key = secrets.token_hex(256)  # Simulated RSA private key
-            public_key = secrets.token_hex(64)    # Simulated RSA public key
-        elif algorithm == SignatureAlgorithm.ECDSA_SHA256:
-            private_key = secrets.token_hex(32)   # Simulated ECDSA private key
-            public_key = secrets.token_hex(64)    # Simulated ECDSA public key
-        elif algorithm == SignatureAlgorithm.ED25519:
-            private_key = secrets.token_hex(32)   # Simulated Ed25519 private key
-            public_key = secrets.token_hex(32)    # Simulated Ed25519 public key
-        else:
+        """Generate key pair for algorithm (hex DER private and public keys)"""
+        key_type = _DEFAULT_KEY_TYPES.get(algorithm)
+        if key_type is None:
             raise ValueError(f"Unsupported algorithm: {algorithm}")
         
-        return private_key, public_key
+        return self._generate_key_pair_for_type(key_type)
+    
+    @staticmethod
+    def _serialize_private_key(key) -> str:
+        """Encode private key as hex PKCS#8 DER"""
+        return key.private_bytes(
+            serialization.Encoding.DER,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ).hex()
+    
+    @staticmethod
+    def _public_key_der(key) -> bytes:
+        """Encode public key as SubjectPublicKeyInfo DER"""
+        return key.public_bytes(
+            serialization.Encoding.DER,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+    
+    @staticmethod
+    def _serialize_public_key(key) -> str:
+        """Encode public key as hex SubjectPublicKeyInfo DER"""
+        return SignatureManager._public_key_der(key).hex()
+    
+    @staticmethod
+    def _load_private_key(private_key: str):
+        """Load private key from PEM or hex DER"""
+        if private_key.startswith("-----BEGIN"):
+            return serialization.load_pem_private_key(private_key.encode(), password=None)
+        return serialization.load_der_private_key(bytes.fromhex(private_key), password=None)
     
     def _generate_key_pair_for_type(self, key_type: KeyType) -> tuple[str, str]:
-        """Generate key pair for key type"""
-        import secrets
-        
-        if key_type in [KeyType.RSA_2048, KeyType.RSA_4096]:
-            key_size = 256 if key_type == KeyType.RSA_2048 else 512
-            private_key = secrets.token_hex(key_size)
-            public_key = secrets.token_hex(64)
+        """Generate key pair for key type (hex DER private and public keys)"""
+        if key_type in (KeyType.RSA_2048, KeyType.RSA_4096):
+            key_size = 2048 if key_type == KeyType.RSA_2048 else 4096
+            key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
         elif key_type == KeyType.ECDSA_P256:
-            private_key = secrets.token_hex(32)
-            public_key = secrets.token_hex(64)
+            key = ec.generate_private_key(ec.SECP256R1())
         elif key_type == KeyType.ED25519:
-            private_key = secrets.token_hex(32)
-            public_key = secrets.token_hex(32)
+            key = ed25519.Ed25519PrivateKey.generate()
         else:
             raise ValueError(f"Unsupported key type: {key_type}")
         
-        return private_key, public_key
-    
-    def _extract_public_key(self, private_key: str, algorithm: SignatureAlgorithm) -> str:
-        """Extract public key from private key"""
-        # In production, use cryptography library
-        # For now, simulate extraction
-        return hashlib.sha256(private_key.encode()).hexdigest()
+        return self._serialize_private_key(key), self._serialize_public_key(key.public_key())
     
-    def _sign_data(self, data: str, private_key: str, algorithm: SignatureAlgorithm) -> str:
-        """Sign data with private key"""
-        # In production, use cryptography library for real signatures
-        # For now, simulate signature
-        
-        combined = f"{data}:{private_key}:{algorithm.value}"
-        signature = hashlib.sha256(combined.encode()).hexdigest()
+    @staticmethod
+    def _sign_digest(message: bytes, key, algorithm: SignatureAlgorithm) -> bytes:
+        """Sign a raw digest with an already-loaded private key"""
+        if algorithm == SignatureAlgorithm.RSA_SHA256:
+            signature = key.sign(message, _RSA_PADDING, _SHA256)
+        elif algorithm == SignatureAlgorithm.ECDSA_SHA256:
+            signature = key.sign(message, _ECDSA_SHA256)
+        elif algorithm == SignatureAlgorithm.ED25519:
+            signature = key.sign(message)
+        else:
+            raise ValueError(f"Unsupported algorithm: {algorithm}")
         
         return signature
     
+    @staticmethod
     def _verify_signature_data(
-        self,
-        data: str,
-        signature: str,
-        public_key: str,
+        message: bytes,
+        signature: bytes,
+        public_key: bytes,
         algorithm: SignatureAlgorithm
     ) -> bool:
-        """Verify signature"""
-        # In production, use cryptography library for real verification
-        # For now, simulate verification by checking signature format
+        """Verify signature over a raw digest (DER public key)"""
+        key = serialization.load_der_public_key(public_key)
         
-        # Check signature is valid hex
         try:
-            int(signature, 16)
-            return len(signature) == 64  # SHA-256 hex
-        except ValueError:
+            if algorithm == SignatureAlgorithm.RSA_SHA256:
+                key.verify(signature, message, _RSA_PADDING, _SHA256)
+            elif algorithm == SignatureAlgorithm.ECDSA_SHA256:
+                key.verify(signature, message, _ECDSA_SHA256)
+            elif algorithm == SignatureAlgorithm.ED25519:
+                key.verify(signature, message)
+            else:
+                raise ValueError(f"Unsupported algorithm: {algorithm}")
+        except InvalidSignature:
             return False
+        
+        return True
     
-    def _generate_signature_id(self, package_id: str, suffix: str = "") -> str:
-        """Generate signature ID"""
-        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
-        content = f"sig_{package_id}_{suffix}_{timestamp}"
-        hash_suffix = self.hash_utils.sha256(content.encode())[:8]
-        return f"sig_{hash_suffix}"
+    @staticmethod
+    def _generate_signature_id() -> str:
+        """
+        Generate signature ID
+        
+        IDs only need to be unique, so they are random rather than derived
+        from the package ID and a timestamp.
+        """
+        return "sig_" + secrets.token_hex(_SIGNATURE_ID_BYTES)
     
     def _store_signature(self, signature: DigitalSignature):
-        """Store signature to disk"""
-        signature_file = self.keys_path / f"{signature.signature_id}.json"
-        signature_file.write_text(signature.json(indent=2))
+        """
+        Store a new signature to disk
+        
+        The record is created exclusively, so an ID collision never
+        overwrites an existing signature; the signature gets a fresh ID
+        instead.
+        
+        Raises:
+            SignatureError: If no unused signature ID is found
+        """
+        for _ in range(_SIGNATURE_ID_ATTEMPTS):
+            # orjson encodes datetimes (ISO 8601) and str enums natively
+            try:
+                self._write_signature_record(
+                    signature.signature_id, orjson.dumps(signature.model_dump()), create=True
+                )
+                return
+            except FileExistsError:
+                signature.signature_id = self._generate_signature_id()
+        
+        raise SignatureError("Failed to allocate a unique signature ID")
+    
+    def _write_signature_record(self, signature_id: str, record: bytes, create: bool = False):
+        """
+        Write a JSON signature record, gzipped
+        
+        Args:
+            signature_id: Signature identifier
+            record: JSON-encoded signature record
+            create: Fail with FileExistsError instead of replacing an
+                existing record
+        """
+        signature_file = f"{self._keys_str}{os.sep}{signature_id}{_SIGNATURE_SUFFIX}"
+        payload = memoryview(gzip.compress(record, compresslevel=_SIGNATURE_COMPRESS_LEVEL))
+        
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_EXCL if create else os.O_TRUNC)
+        fd = os.open(signature_file, flags, _SIGNATURE_FILE_MODE)
+        try:
+            while payload:
+                payload = payload[os.write(fd, payload):]
+        finally:
+            os.close(fd)
     
     def load_signature(self, signature_id: str) -> Optional[DigitalSignature]:
         """Load signature from storage"""
-        signature_file = self.keys_path / f"{signature_id}.json"
+        record = self._load_signature_record(signature_id)
+        if record is None:
+            return None
+        
+        return DigitalSignature.model_validate_json(record)
+    
+    def load_signature_header(self, signature_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load only the identifying fields of a stored signature
+        
+        Skips model validation (and timestamp parsing) for lookups that
+        do not need a full DigitalSignature.
+        
+        Args:
+            signature_id: Signature identifier
+        
+        Returns:
+            Dict of signature_id, package_id, algorithm and is_valid, or None
+        """
+        record = self._load_signature_record(signature_id)
+        if record is None:
+            return None
+        
+        data = orjson.loads(record)
+        return {field: data.get(field) for field in _SIGNATURE_HEADER_FIELDS}
+    
+    def find_signature(self, package_id: str) -> Optional[DigitalSignature]:
+        """
+        Find a stored signature for a package
+        
+        Args:
+            package_id: Signed package ID
+        
+        Returns:
+            First matching signature, or None
+        """
+        current, legacy = [], []
+        with os.scandir(self._keys_str) as entries:
+            for entry in entries:
+                if entry.name.endswith(_SIGNATURE_SUFFIX):
+                    current.append(entry.path)
+                elif entry.name.endswith(_LEGACY_SIGNATURE_SUFFIX):
+                    legacy.append(entry.path)
+        
+        # Current-format records first: re-storing a legacy record (e.g. on
+        # revocation) leaves the stale .json alongside the new .json.gz.
+        # Only the matching record is validated into a model.
+        for signature_file in current + legacy:
+            try:
+                data = orjson.loads(self._read_signature_file(signature_file))
+                if data.get("package_id") == package_id:
+                    return DigitalSignature.model_validate(data)
+            except Exception:
+                continue
         
-        if signature_file.exists():
-            return DigitalSignature.parse_raw(signature_file.read_text())
+        return None
+    
+    def _load_signature_record(self, signature_id: str) -> Optional[bytes]:
+        """Read the JSON record for a signature ID, or None if not stored"""
+        base = f"{self._keys_str}{os.sep}{signature_id}"
+        
+        for suffix in (_SIGNATURE_SUFFIX, _LEGACY_SIGNATURE_SUFFIX):
+            try:
+                return self._read_signature_file(base + suffix)
+            except FileNotFoundError:
+                continue
         
         return None
     
+    @staticmethod
+    def _read_signature_file(signature_file: str) -> bytes:
+        """Read a signature record file as JSON bytes, gzipped or plain"""
+        with open(signature_file, "rb") as f:
+            data = f.read()
+        
+        if data[:2] == _GZIP_MAGIC:
+            data = gzip.decompress(data)
+        
+        return data
+    
     def revoke_signature(self, signature_id: str, reason: str) -> bool:
         """
         Revoke signature
         
+        Only is_valid changes, so the stored record is updated as plain JSON
+        without building a DigitalSignature.
+        
         Args:
             signature_id: Signature to revoke
             reason: Revocation reason
@@ -374,12 +739,13 @@ Public Key: {public_key[:32]}...
         Returns:
             True if revoked
         """
-        signature = self.load_signature(signature_id)
-        if not signature:
+        record = self._load_signature_record(signature_id)
+        if record is None:
             return False
         
         # Mark as invalid
-        signature.is_valid = False
+        data = orjson.loads(record)
+        data["is_valid"] = False
         
         # Add revocation metadata
         revocation_info = {
@@ -388,38 +754,46 @@ Public Key: {public_key[:32]}...
         }
         
         # Store updated signature
-        self._store_signature(signature)
+        self._write_signature_record(signature_id, orjson.dumps(data))
         
         return True
     
     def get_signature_info(self, signature: DigitalSignature) -> Dict[str, Any]:
-        """Get signature information"""
-        return {
-            "signature_id": signature.signature_id,
-            "package_id": signature.package_id,
-            "algorithm": signature.algorithm.value,
-            "signer": {
-                "id": signature.signer_id,
-                "name": signature.signer_name,
-                "email": signature.signer_email
-            },
-            "timestamp": signature.timestamp.isoformat(),
-            "is_valid": signature.is_valid,
-            "verified_at": signature.verified_at.isoformat() if signature.verified_at else None,
-            "package_hash": signature.package_hash
-        }
+        """Get signature information (JSON-ready; datetimes as ISO 8601)"""
+        return SignatureInfoView.from_signature(signature).model_dump(mode="json")
     
     def export_public_key(self, signature: DigitalSignature, format: str = "pem") -> str:
         """Export public key in specified format"""
         if format == "pem":
-            return f"""-----BEGIN PUBLIC KEY-----
-{signature.public_key}
------END PUBLIC KEY-----"""
+            return _public_key_pem(signature.public_key)
         elif format == "hex":
-            return signature.public_key
+            return signature.public_key.hex()
         else:
             raise ValueError(f"Unsupported format: {format}")
     
     def get_supported_algorithms(self) -> list[str]:
         """Get list of supported signature algorithms"""
         return [algo.value for algo in SignatureAlgorithm]
+
+
+def _verify_job(job: Tuple[AttestationPackage, bytes, bytes, bytes, SignatureAlgorithm]) -> bool:
+    """Verify one (package, hash, signature, key, algorithm) job; runs in worker processes"""
+    package, package_hash, signature_value, public_key, algorithm = job
+    
+    if not hmac.compare_digest(package.compute_digest(), package_hash):
+        return False
+    
+    try:
+        return SignatureManager._verify_signature_data(
+            package_hash, signature_value, public_key, algorithm
+        )
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=256)
+def _public_key_pem(public_key: bytes) -> str:
+    """Wrap a DER public key in PEM armor (memoized per key)"""
+    body = base64.b64encode(public_key)
+    lines = [body[i:i + _PEM_LINE_LENGTH] for i in range(0, len(body), _PEM_LINE_LENGTH)]
+    return (_PEM_HEADER + b"\n".join(lines) + _PEM_FOOTER).decode()
@@ -3,40 +3,70 @@ Authentication and Authorization
 JWT token handling and permission management
 """
 
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from calendar import timegm
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple, Union, AbstractSet, FrozenSet
+from jose import JWTError, jwk, jwt
+import bcrypt
 import logging
+import sys
+import time
 
 from app.config import settings
 from app.utils.errors import AuthenticationError, AuthorizationError
 
 logger = logging.getLogger(__name__)
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt only uses the first 72 bytes of a password; longer input is truncated
+# explicitly, as passlib did, instead of being rejected by newer bcrypt releases
+_BCRYPT_MAX_PASSWORD_BYTES = 72
 
+# JWT exp/iat claims are NumericDate values (epoch seconds)
+_SECONDS_PER_HOUR = 3600
 
+
+@lru_cache(maxsize=8)
+def _jwt_key(secret: str, algorithm: str) -> Tuple[Any, List[str]]:
+    """
+    Get the parsed JWT key and allowed-algorithms list for settings values
+    
+    jose re-constructs (and for RSA/EC, re-parses PEM) the key on every
+    encode/decode unless handed a Key object; caching keyed by the settings
+    values keeps that to once per configuration.
+    
+    With python-jose[cryptography] installed, jwk.construct returns the
+    cryptography-backed key classes, so HMAC and signature operations run
+    in OpenSSL rather than pycryptodome or the pure-Python backend.
+    """
+    return jwk.construct(secret, algorithm), [algorithm]
+
+
+@dataclass(slots=True)
 class TokenPayload:
     """JWT token payload structure"""
-    def __init__(self, 
-                 sub: str,
-                 tenant_id: str,
-                 permissions: List[str],
-                 exp: Optional[datetime] = None):
-        self.sub = sub  # Subject (user ID)
-        self.tenant_id = tenant_id
-        self.permissions = permissions
-        self.exp = exp or datetime.utcnow() + timedelta(hours=settings.JWT_EXPIRATION_HOURS)
+    sub: str  # Subject (user ID)
+    tenant_id: str
+    permissions: FrozenSet[str]
+    exp: Optional[Union[int, datetime]] = None
+    
+    def __post_init__(self):
+        if not isinstance(self.permissions, frozenset):
+            self.permissions = frozenset(self.permissions)
+        # Expiry is kept as epoch seconds; naive datetimes are taken as UTC, as jose does
+        if self.exp is None:
+            self.exp = int(time.time()) + settings.JWT_EXPIRATION_HOURS * _SECONDS_PER_HOUR
+        elif isinstance(self.exp, datetime):
+            self.exp = timegm(self.exp.utctimetuple())
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             "sub": self.sub,
             "tenant_id": self.tenant_id,
-            "permissions": self.permissions,
+            "permissions": sorted(self.permissions),
             "exp": self.exp,
-            "iat": datetime.utcnow()
+            "iat": int(time.time())
         }
 
 
@@ -55,9 +85,10 @@ class JWTHandler:
             JWT token string
         """
         to_encode = payload.to_dict()
+        key, _ = _jwt_key(settings.JWT_SECRET, settings.JWT_ALGORITHM)
         encoded_jwt = jwt.encode(
             to_encode,
-            settings.JWT_SECRET,
+            key,
             algorithm=settings.JWT_ALGORITHM
         )
         return encoded_jwt
@@ -76,11 +107,12 @@ class JWTHandler:
         Raises:
             AuthenticationError: If token is invalid or expired
         """
+        key, algorithms = _jwt_key(settings.JWT_SECRET, settings.JWT_ALGORITHM)
         try:
             payload = jwt.decode(
                 token,
-                settings.JWT_SECRET,
-                algorithms=[settings.JWT_ALGORITHM]
+                key,
+                algorithms=algorithms
             )
             return payload
         except JWTError as e:
@@ -110,7 +142,9 @@ class JWTHandler:
         return TokenPayload(
             sub=payload_dict["sub"],
             tenant_id=payload_dict["tenant_id"],
-            permissions=payload_dict.get("permissions", []),
+            # Interned so membership checks against the scope constants
+            # short-circuit on identity
+            permissions=frozenset(map(sys.intern, payload_dict.get("permissions", ()))),
             exp=payload_dict.get("exp")
         )
 
@@ -118,37 +152,36 @@ class JWTHandler:
 class PermissionChecker:
     """Permission checking utilities"""
     
-    # Permission scopes
-    GENERATE = "zkpa:generate"
-    VERIFY = "zkpa:verify"
-    REVOKE = "zkpa:revoke"
-    ADMIN = "zkpa:admin"
+    # Permission scopes (interned explicitly: literals containing ":" are not
+    # interned by the compiler)
+    GENERATE = sys.intern("zkpa:generate")
+    VERIFY = sys.intern("zkpa:verify")
+    REVOKE = sys.intern("zkpa:revoke")
+    ADMIN = sys.intern("zkpa:admin")
     
     @staticmethod
-    def has_permission(user_permissions: List[str], required_permission: str) -> bool:
+    def has_permission(user_permissions: AbstractSet[str], required_permission: str) -> bool:
         """
         Check if user has required permission
         
         Args:
-            user_permissions: List of user's permissions
+            user_permissions: Set of user's permissions
             required_permission: Required permission
             
         Returns:
             True if user has permission
         """
         # Admin has all permissions
-        if PermissionChecker.ADMIN in user_permissions:
-            return True
-        
-        return required_permission in user_permissions
+        return (PermissionChecker.ADMIN in user_permissions
+                or required_permission in user_permissions)
     
     @staticmethod
-    def require_permission(user_permissions: List[str], required_permission: str):
+    def require_permission(user_permissions: AbstractSet[str], required_permission: str):
         """
         Require a specific permission (raises error if not present)
         
         Args:
-            user_permissions: List of user's permissions
+            user_permissions: Set of user's permissions
             required_permission: Required permission
             
         Raises:
@@ -160,20 +193,23 @@ class PermissionChecker:
             )
     
     @staticmethod
-    def require_any_permission(user_permissions: List[str], required_permissions: List[str]):
+    def require_any_permission(user_permissions: AbstractSet[str], required_permissions: List[str]):
         """
         Require at least one of the specified permissions
         
         Args:
-            user_permissions: List of user's permissions
+            user_permissions: Set of user's permissions
             required_permissions: List of acceptable permissions
             
         Raises:
             AuthorizationError: If none of the permissions present
         """
-        for permission in required_permissions:
-            if PermissionChecker.has_permission(user_permissions, permission):
-                return
+        if PermissionChecker.ADMIN in user_permissions:
+            return
+        
+        # frozenset() of a frozenset is the same object, so this is free for TokenPayload
+        if not frozenset(user_permissions).isdisjoint(required_permissions):
+            return
         
         raise AuthorizationError(
             f"Insufficient permissions. Required one of: {', '.join(required_permissions)}"
@@ -194,13 +230,19 @@ class PasswordHandler:
         Returns:
             Hashed password
         """
-        return pwd_context.hash(password)
+        return bcrypt.hashpw(
+            password.encode()[:_BCRYPT_MAX_PASSWORD_BYTES],
+            bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+        ).decode()
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """
         Verify a password against a hash
         
+        Accepts any standard bcrypt hash ($2a$, $2b$, $2y$), including
+        hashes previously produced through passlib.
+        
         Args:
             plain_password: Plain text password
             hashed_password: Hashed password
@@ -208,7 +250,14 @@ class PasswordHandler:
         Returns:
             True if password matches
         """
-        return pwd_context.verify(plain_password, hashed_password)
+        try:
+            return bcrypt.checkpw(
+                plain_password.encode()[:_BCRYPT_MAX_PASSWORD_BYTES],
+                hashed_password.encode()
+            )
+        except ValueError:
+            # Not a bcrypt hash
+            return False
 
 
 class TenantValidator:
@@ -2,13 +2,14 @@
 Evidence Processing Core Components
 """
 
-from .normalizer import EvidenceNormalizer, NormalizedEvidence
+from .normalizer import EvidenceNormalizer, NormalizedEvidence, CustodyEntry
 from .commitment import EvidenceCommitment, CommitmentGenerator
 from .storage import EvidenceStorage, StorageBackend
 
 __all__ = [
     "EvidenceNormalizer",
     "NormalizedEvidence",
+    "CustodyEntry",
     "EvidenceCommitment",
     "CommitmentGenerator",
     "EvidenceStorage",
@@ -3,21 +3,65 @@ Evidence Normalizer
 Converts various evidence formats into canonical normalized format
 """
 
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple, Union
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 import json
+from hashlib import sha256 as _sha256
 import base64
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
 
 from app.utils.crypto import HashUtils
-from app.utils.errors import ValidationError
+from app.utils.errors import EvidenceError, ValidationError
+
+logger = logging.getLogger(__name__)
+
+# Same output as json.dumps(..., sort_keys=True); content hashes depend on it
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True)
+
+# File signatures for binary evidence, keyed by their 4- or 3-byte prefix
+_MAGIC_CONTENT_TYPES = {
+    b'%PDF': 'application/pdf',
+    b'\x89PNG': 'image/png',
+    b'\xff\xd8\xff': 'image/jpeg',
+}
+
+# Read size when streaming evidence files through SHA-256
+_FILE_HASH_CHUNK_SIZE = 64 * 1024
+
+# Leading bytes kept from evidence files for content type detection
+_MAGIC_PREFIX_SIZE = 4
+
+# Evidence items handed to each worker per dispatch in normalize_batch
+_NORMALIZE_CHUNK_SIZE = 64
+
+
+def _log_skipped(error: Exception):
+    """Log a batch item that could not be normalized and is being skipped"""
+    logger.error(f"Error normalizing evidence: {error}")
+
+
+@dataclass(slots=True)
+class CustodyEntry:
+    """
+    One hand-off in an evidence item's chain of custody
+    """
+    actor: str
+    action: str
+    timestamp: datetime
+    content_hash: Optional[str] = None
 
 
 class NormalizedEvidence(BaseModel):
     """
     Canonical evidence format after normalization
     """
+    model_config = ConfigDict(frozen=True)
+    
     evidence_id: str = Field(..., description="Unique evidence identifier")
     evidence_type: str = Field(..., description="Type of evidence (log, scan, artifact, etc.)")
     source_system: str = Field(..., description="System that generated the evidence")
@@ -35,23 +79,19 @@ class NormalizedEvidence(BaseModel):
     # Provenance
     collector_id: Optional[str] = Field(None, description="ID of collector agent/system")
     collection_method: Optional[str] = Field(None, description="How evidence was collected")
-    chain_of_custody: List[Dict[str, Any]] = Field(default_factory=list, description="Custody chain")
+    chain_of_custody: List[CustodyEntry] = Field(default_factory=list, description="Custody chain")
     
     # Classification
     sensitivity_level: str = Field(default="normal", description="Sensitivity: public, internal, confidential, secret")
     compliance_tags: List[str] = Field(default_factory=list, description="Compliance framework tags")
     
-    @validator('sensitivity_level')
+    @field_validator('sensitivity_level')
+    @classmethod
     def validate_sensitivity(cls, v):
         valid_levels = ['public', 'internal', 'confidential', 'secret']
         if v not in valid_levels:
             raise ValueError(f"sensitivity_level must be one of {valid_levels}")
         return v
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class EvidenceNormalizer:
@@ -60,7 +100,7 @@ class EvidenceNormalizer:
     """
     
     # Supported evidence types
-    SUPPORTED_TYPES = {
+    SUPPORTED_TYPES: FrozenSet[str] = frozenset({
         'log',
         'scan_result',
         'test_result',
@@ -73,10 +113,10 @@ class EvidenceNormalizer:
         'penetration_test',
         'access_log',
         'change_log',
-    }
+    })
     
     # Supported source systems
-    SUPPORTED_SOURCES = {
+    SUPPORTED_SOURCES: FrozenSet[str] = frozenset({
         'github',
         'gitlab',
         'jenkins',
@@ -88,10 +128,17 @@ class EvidenceNormalizer:
         'sast', # Static Analysis
         'dast', # Dynamic Analysis
         'manual', # Manual upload
-    }
+    })
     
     def __init__(self):
         self.hash_utils = HashUtils()
+        # Source system -> metadata extractor for dict evidence
+        self._extractors = {
+            'github': self._extract_github_metadata,
+            'gitlab': self._extract_gitlab_metadata,
+            'sonarqube': self._extract_sonarqube_metadata,
+            'cma': self._extract_cma_metadata,
+        }
     
     def normalize(
         self,
@@ -116,18 +163,103 @@ class EvidenceNormalizer:
             ValidationError: If evidence cannot be normalized
         """
         # Validate inputs
-        if evidence_type not in self.SUPPORTED_TYPES:
+        self._check_supported(evidence_type, source_system)
+        
+        return self._normalize_fast(raw_evidence, evidence_type, source_system, metadata)
+    
+    def _check_supported(self, evidence_type: Any, source_system: Any):
+        """
+        Reject unsupported (or non-string) evidence types and source systems
+        
+        Raises:
+            ValidationError: If the type or source is unsupported
+        """
+        if not isinstance(evidence_type, str) or evidence_type not in self.SUPPORTED_TYPES:
             raise ValidationError(f"Unsupported evidence type: {evidence_type}")
         
-        if source_system not in self.SUPPORTED_SOURCES:
+        if not isinstance(source_system, str) or source_system not in self.SUPPORTED_SOURCES:
             raise ValidationError(f"Unsupported source system: {source_system}")
+    
+    def normalize_from_path(
+        self,
+        path: Union[str, Path],
+        evidence_type: str,
+        source_system: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> NormalizedEvidence:
+        """
+        Normalize a file-based artifact without loading it into memory
+        
+        The file is streamed through SHA-256, so the result matches
+        normalize() on the file's bytes at constant memory.
+        
+        Args:
+            path: Path to the evidence file
+            evidence_type: Type of evidence
+            source_system: Source system identifier
+            metadata: Additional metadata
+        
+        Returns:
+            NormalizedEvidence instance
+        
+        Raises:
+            ValidationError: If the evidence type or source is unsupported
+            EvidenceError: If the file cannot be read
+        """
+        self._check_supported(evidence_type, source_system)
+        
+        sha256_hash = _sha256()
+        content_size = 0
         
+        try:
+            with open(path, "rb") as f:
+                # Keep the leading bytes for content type detection
+                header = f.read(_MAGIC_PREFIX_SIZE)
+                chunk = header
+                while chunk:
+                    sha256_hash.update(chunk)
+                    content_size += len(chunk)
+                    chunk = f.read(_FILE_HASH_CHUNK_SIZE)
+        except OSError as e:
+            raise EvidenceError(f"Cannot read evidence file {path}: {e}")
+        
+        # Binary content carries no source metadata, so the header stands in for it
+        return self._build_normalized(
+            header, evidence_type, source_system, metadata,
+            sha256_hash.hexdigest(), content_size
+        )
+    
+    def _normalize_fast(
+        self,
+        raw_evidence: Union[Dict[str, Any], str, bytes],
+        evidence_type: str,
+        source_system: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> NormalizedEvidence:
+        """Normalize evidence whose type and source have already been checked"""
+        content_hash, content_size = self._hash_content(raw_evidence)
+        return self._build_normalized(
+            raw_evidence, evidence_type, source_system, metadata, content_hash, content_size
+        )
+    
+    def _hash_content(self, raw_evidence: Union[Dict[str, Any], str, bytes]) -> Tuple[str, int]:
+        """Hash evidence content, returning its SHA-256 hex digest and size in bytes"""
         # Convert to bytes for hashing
         content_bytes = self._to_bytes(raw_evidence)
         
         # Generate hash
-        content_hash = self.hash_utils.sha256(content_bytes)
-        
+        return _sha256(content_bytes).hexdigest(), len(content_bytes)
+    
+    def _build_normalized(
+        self,
+        raw_evidence: Union[Dict[str, Any], str, bytes],
+        evidence_type: str,
+        source_system: str,
+        metadata: Optional[Dict[str, Any]],
+        content_hash: str,
+        content_size: int
+    ) -> NormalizedEvidence:
+        """Build normalized evidence from already hashed content"""
         # Determine content type
         content_type = self._determine_content_type(raw_evidence)
         
@@ -146,7 +278,7 @@ class EvidenceNormalizer:
             source_system=source_system,
             content_hash=content_hash,
             content_type=content_type,
-            content_size=len(content_bytes),
+            content_size=content_size,
             collected_at=datetime.utcnow(),
             metadata=extracted_metadata,
             source_id=extracted_metadata.get('source_id'),
@@ -160,35 +292,100 @@ class EvidenceNormalizer:
     
     def normalize_batch(
         self,
-        evidence_list: List[Dict[str, Any]]
+        evidence_list: List[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        chunk_size: int = _NORMALIZE_CHUNK_SIZE,
+        dedupe: bool = False
     ) -> List[NormalizedEvidence]:
         """
         Normalize multiple evidence items
         
+        Content is hashed in chunks on a thread pool; hashlib releases
+        the GIL while hashing large content, so big batches scale across
+        cores. Items that fail to normalize are skipped.
+        
         Args:
             evidence_list: List of evidence items with required fields
+            max_workers: Maximum worker threads (defaults to the CPU count)
+            chunk_size: Number of items handed to a worker at a time
+            dedupe: Drop items repeating the source, type and content of an
+                earlier item (they would share its evidence ID); the first
+                item's metadata is kept
         
         Returns:
-            List of normalized evidence
+            List of normalized evidence, in input order
         """
+        # Check types and sources once up front so workers skip the lookups
+        supported = []
+        for item in evidence_list:
+            try:
+                self._check_supported(item.get('type'), item.get('source'))
+            except Exception as e:
+                _log_skipped(e)
+                continue
+            supported.append(item)
+        evidence_list = supported
+        
+        chunk_size = max(1, chunk_size)
+        chunks = [
+            evidence_list[i:i + chunk_size]
+            for i in range(0, len(evidence_list), chunk_size)
+        ]
+        
+        if len(chunks) <= 1:
+            digests = [self._hash_one(item) for item in evidence_list]
+        else:
+            workers = min(max_workers or os.cpu_count() or 1, len(chunks))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                digests = [
+                    digest
+                    for chunk_digests in executor.map(self._hash_chunk, chunks)
+                    for digest in chunk_digests
+                ]
+        
         normalized_list = []
+        seen = set()
         
-        for item in evidence_list:
+        for item, digest in zip(evidence_list, digests):
+            if digest is None:
+                continue
+            
+            # Duplicates would get the same evidence ID; skip building them
+            if dedupe:
+                key = (item['source'], item['type'], digest[0])
+                if key in seen:
+                    continue
+                seen.add(key)
+            
             try:
-                normalized = self.normalize(
+                normalized_list.append(self._build_normalized(
                     raw_evidence=item.get('content'),
-                    evidence_type=item.get('type'),
-                    source_system=item.get('source'),
-                    metadata=item.get('metadata')
-                )
-                normalized_list.append(normalized)
+                    evidence_type=item['type'],
+                    source_system=item['source'],
+                    metadata=item.get('metadata'),
+                    content_hash=digest[0],
+                    content_size=digest[1]
+                ))
             except Exception as e:
                 # Log error but continue processing other items
-                print(f"Error normalizing evidence: {e}")
+                _log_skipped(e)
                 continue
         
         return normalized_list
     
+    def _hash_chunk(self, items: List[Dict[str, Any]]) -> List[Optional[Tuple[str, int]]]:
+        """Hash the content of a slice of a batch on one worker"""
+        return [self._hash_one(item) for item in items]
+    
+    def _hash_one(self, item: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+        """Hash one batch item's content, returning None if it cannot be hashed"""
+        try:
+            return self._hash_content(item.get('content'))
+        except Exception as e:
+            # Log error but continue processing other items
+            _log_skipped(e)
+            return None
+    
     def _to_bytes(self, data: Union[Dict, str, bytes]) -> bytes:
         """Convert data to bytes for hashing"""
         if isinstance(data, bytes):
@@ -197,22 +394,18 @@ class EvidenceNormalizer:
             return data.encode('utf-8')
         elif isinstance(data, dict):
             # Sort keys for consistent hashing
-            return json.dumps(data, sort_keys=True).encode('utf-8')
+            return _CANONICAL_ENCODER.encode(data).encode('utf-8')
         else:
             return str(data).encode('utf-8')
     
     def _determine_content_type(self, data: Union[Dict, str, bytes]) -> str:
         """Determine MIME type or content format"""
         if isinstance(data, bytes):
-            # Try to detect file type
-            if data.startswith(b'%PDF'):
-                return 'application/pdf'
-            elif data.startswith(b'\x89PNG'):
-                return 'image/png'
-            elif data.startswith(b'\xff\xd8\xff'):
-                return 'image/jpeg'
-            else:
-                return 'application/octet-stream'
+            # Try to detect file type from its leading bytes
+            return (
+                _MAGIC_CONTENT_TYPES.get(data[:4])
+                or _MAGIC_CONTENT_TYPES.get(data[:3], 'application/octet-stream')
+            )
         elif isinstance(data, dict):
             return 'application/json'
         else:
@@ -224,24 +417,18 @@ class EvidenceNormalizer:
         source_system: str
     ) -> Dict[str, Any]:
         """Extract metadata from evidence based on source system"""
-        metadata = {}
-        
         if not isinstance(raw_evidence, dict):
-            return metadata
+            return {}
         
         # Source-specific metadata extraction
-        if source_system == 'github':
-            metadata.update(self._extract_github_metadata(raw_evidence))
-        elif source_system == 'gitlab':
-            metadata.update(self._extract_gitlab_metadata(raw_evidence))
-        elif source_system == 'sonarqube':
-            metadata.update(self._extract_sonarqube_metadata(raw_evidence))
-        elif source_system == 'cma':
-            metadata.update(self._extract_cma_metadata(raw_evidence))
+        extractor = self._extractors.get(source_system)
+        if extractor is None:
+            return {}
         
-        return metadata
+        return extractor(raw_evidence)
     
-    def _extract_github_metadata(self, data: Dict) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_github_metadata(data: Dict) -> Dict[str, Any]:
         """Extract GitHub-specific metadata"""
         return {
             'repository': data.get('repository'),
@@ -252,7 +439,8 @@ class EvidenceNormalizer:
             'source_id': data.get('id'),
         }
     
-    def _extract_gitlab_metadata(self, data: Dict) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_gitlab_metadata(data: Dict) -> Dict[str, Any]:
         """Extract GitLab-specific metadata"""
         return {
             'project_id': data.get('project_id'),
@@ -263,7 +451,8 @@ class EvidenceNormalizer:
             'source_id': data.get('id'),
         }
     
-    def _extract_sonarqube_metadata(self, data: Dict) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_sonarqube_metadata(data: Dict) -> Dict[str, Any]:
         """Extract SonarQube-specific metadata"""
         return {
             'project_key': data.get('projectKey'),
@@ -273,7 +462,8 @@ class EvidenceNormalizer:
             'source_id': data.get('taskId'),
         }
     
-    def _extract_cma_metadata(self, data: Dict) -> Dict[str, Any]:
+    @staticmethod
+    def _extract_cma_metadata(data: Dict) -> Dict[str, Any]:
         """Extract CMA (Continuous Monitoring Agent) metadata"""
         return {
             'assessment_id': data.get('assessmentId'),
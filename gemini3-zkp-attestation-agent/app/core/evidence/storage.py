@@ -3,18 +3,77 @@ Evidence Storage Layer
 Provides encrypted storage with multiple backend support
 """
 
-from typing import Optional, Dict, Any, BinaryIO
+from typing import Optional, Dict, Any, List, AsyncIterable, AsyncIterator, Awaitable, BinaryIO, Union
 from pathlib import Path
 from datetime import datetime
 from abc import ABC, abstractmethod
+from functools import lru_cache
+import asyncio
+import hashlib
 import os
 import shutil
+import sqlite3
+import threading
+import time
 from enum import Enum
 
-from app.utils.crypto import CryptoUtils, KeyManager
-from app.utils.errors import StorageError, ValidationError
+import aiofiles
+import orjson
+
+from app.utils.crypto import CryptoUtils, KeyManager, ENCRYPTION_FORMAT_NONCE_HEADER, ENCRYPTION_FORMAT_TRAILING_NONCE
+from app.utils.errors import CryptoError, StorageError, ValidationError
 from app.config import settings
 
+# Evidence items stored or retrieved concurrently per bundle
+_BUNDLE_IO_CONCURRENCY = 16
+
+# Chunk size for streaming evidence through encryption and onto disk
+_STREAM_CHUNK_SIZE = 1024 * 1024
+
+# SQLite index holding object metadata for LocalStorageBackend
+_METADATA_DB_NAME = "_meta.db"
+
+# Evidence ID -> storage key mappings kept for repeat operations
+_STORAGE_KEY_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_STORAGE_KEY_CACHE_SIZE)
+def _storage_key(evidence_id: str) -> str:
+    """Map an evidence ID to its hash-sharded storage key"""
+    # Two levels of 256-way shards bound the width of any one directory
+    # e.g., github:log:abc123 -> evidence/github/3f/a2/log/abc123.bin
+    shard = hashlib.sha256(evidence_id.encode()).hexdigest()
+    source, sep, type_or_hash = evidence_id.partition(':')
+    
+    if sep:
+        return f"evidence/{source}/{shard[:2]}/{shard[2:4]}/{type_or_hash.replace(':', '/')}.bin"
+    else:
+        return f"evidence/{shard[:2]}/{shard[2:4]}/{evidence_id}.bin"
+
+
+def _legacy_storage_key(evidence_id: str) -> str:
+    """Map an evidence ID to its unsharded storage key, used before sharding"""
+    # e.g., github:log:abc123 -> evidence/github/log/abc123.bin
+    source, sep, type_or_hash = evidence_id.partition(':')
+    
+    if sep:
+        return f"evidence/{source}/{type_or_hash.replace(':', '/')}.bin"
+    else:
+        return f"evidence/{evidence_id}.bin"
+
+
+# (epoch second, ISO string) of the last _now_iso() call
+_now_iso_cache = (0, "")
+
+
+def _now_iso() -> str:
+    """Current UTC time in ISO format at second resolution, formatted once per second"""
+    global _now_iso_cache
+    second = int(time.time())
+    if _now_iso_cache[0] != second:
+        _now_iso_cache = (second, datetime.utcfromtimestamp(second).isoformat())
+    return _now_iso_cache[1]
+
 
 class StorageBackendType(str, Enum):
     """Storage backend types"""
@@ -48,6 +107,29 @@ class StorageBackend(ABC):
         """
         pass
     
+    async def store_stream(
+        self,
+        key: str,
+        chunks: AsyncIterable[bytes],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Store a stream of chunks and return URI
+        
+        Backends that can write incrementally should override this; the
+        default collects the chunks and calls store().
+        
+        Args:
+            key: Storage key/path
+            chunks: Data chunks to store, in order
+            metadata: Optional metadata
+        
+        Returns:
+            Storage URI
+        """
+        data = b"".join([chunk async for chunk in chunks])
+        return await self.store(key, data, metadata)
+    
     @abstractmethod
     async def retrieve(self, key: str) -> bytes:
         """
@@ -61,6 +143,43 @@ class StorageBackend(ABC):
         """
         pass
     
+    async def mget(self, keys: List[str]) -> Dict[str, bytes]:
+        """
+        Retrieve several objects in one call
+        
+        Backends that can batch reads (multi-object requests, pooled
+        connections) should override this; the default issues bounded
+        concurrent retrieve() calls.
+        
+        Args:
+            keys: Storage keys
+        
+        Returns:
+            Dict of key -> stored data
+        """
+        semaphore = asyncio.Semaphore(_BUNDLE_IO_CONCURRENCY)
+        
+        async def fetch(key: str) -> bytes:
+            async with semaphore:
+                return await self.retrieve(key)
+        
+        return dict(zip(keys, await asyncio.gather(*(fetch(key) for key in keys))))
+    
+    async def open_stream(self, key: str) -> AsyncIterator[bytes]:
+        """
+        Retrieve data by key as a stream of chunks
+        
+        Backends that can read incrementally should override this; the
+        default yields the result of retrieve() as one chunk.
+        
+        Args:
+            key: Storage key
+        
+        Yields:
+            Stored data chunks, in order
+        """
+        yield await self.retrieve(key)
+    
     @abstractmethod
     async def delete(self, key: str) -> bool:
         """
@@ -115,6 +234,18 @@ class LocalStorageBackend(StorageBackend):
         """
         self.base_path = base_path or Path(settings.STORAGE_PATH)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        
+        # Metadata lives in one indexed table instead of a sidecar file per object;
+        # the connection is shared by worker threads, serialized by the lock
+        self._meta_lock = threading.Lock()
+        self._meta_db = sqlite3.connect(
+            self.base_path / _METADATA_DB_NAME,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._meta_db.execute("PRAGMA journal_mode=WAL")
+        self._meta_db.execute("PRAGMA synchronous=NORMAL")
+        self._meta_db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, json BLOB NOT NULL)")
     
     async def store(
         self,
@@ -125,84 +256,219 @@ class LocalStorageBackend(StorageBackend):
         """Store data to local filesystem"""
         try:
             file_path = self.base_path / key
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(file_path.parent.mkdir, parents=True, exist_ok=True)
             
             # Write data
-            file_path.write_bytes(data)
+            async with aiofiles.open(file_path, 'wb') as f:
+                await f.write(data)
+            
+            await self._write_metadata(key, metadata)
+            
+            return f"file://{file_path.absolute()}"
+        
+        except Exception as e:
+            raise StorageError(f"Failed to store data: {e}")
+    
+    async def store_stream(
+        self,
+        key: str,
+        chunks: AsyncIterable[bytes],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Stream data to local filesystem, one chunk in memory at a time"""
+        try:
+            file_path = self.base_path / key
+            await asyncio.to_thread(file_path.parent.mkdir, parents=True, exist_ok=True)
+            
+            # Write to a side file so a failed stream never leaves a partial object
+            partial_path = file_path.with_name(file_path.name + '.part')
+            try:
+                async with aiofiles.open(partial_path, 'wb') as f:
+                    async for chunk in chunks:
+                        await f.write(chunk)
+                await asyncio.to_thread(os.replace, partial_path, file_path)
+            except BaseException:
+                await asyncio.to_thread(partial_path.unlink, missing_ok=True)
+                raise
             
-            # Write metadata if provided
-            if metadata:
-                metadata_path = file_path.with_suffix('.meta.json')
-                import json
-                metadata_path.write_text(json.dumps(metadata, indent=2))
+            await self._write_metadata(key, metadata)
             
             return f"file://{file_path.absolute()}"
         
         except Exception as e:
             raise StorageError(f"Failed to store data: {e}")
     
+    async def _write_metadata(self, key: str, metadata: Optional[Dict[str, Any]]):
+        """Write metadata if provided"""
+        if metadata:
+            await asyncio.to_thread(self._put_metadata, key, orjson.dumps(metadata))
+    
+    def _put_metadata(self, key: str, metadata_json: bytes):
+        """Upsert an object's metadata row (blocking; run in a thread)"""
+        with self._meta_lock:
+            self._meta_db.execute(
+                "INSERT OR REPLACE INTO meta (key, json) VALUES (?, ?)",
+                (key, metadata_json)
+            )
+    
+    def _get_metadata_row(self, key: str) -> Optional[bytes]:
+        """Fetch an object's metadata JSON, if any (blocking; run in a thread)"""
+        with self._meta_lock:
+            row = self._meta_db.execute("SELECT json FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
     async def retrieve(self, key: str) -> bytes:
         """Retrieve data from local filesystem"""
         try:
             file_path = self.base_path / key
             
-            if not file_path.exists():
+            try:
+                async with aiofiles.open(file_path, 'rb') as f:
+                    return await f.read()
+            except FileNotFoundError:
                 raise StorageError(f"File not found: {key}")
+        
+        except Exception as e:
+            raise StorageError(f"Failed to retrieve data: {e}")
+    
+    async def mget(self, keys: List[str]) -> Dict[str, bytes]:
+        """Retrieve several files, reading each worker's share in one thread hop"""
+        try:
+            groups = [keys[i::_BUNDLE_IO_CONCURRENCY] for i in range(min(len(keys), _BUNDLE_IO_CONCURRENCY))]
+            results = await asyncio.gather(*(
+                asyncio.to_thread(self._read_files, group) for group in groups
+            ))
             
-            return file_path.read_bytes()
+            contents: Dict[str, bytes] = {}
+            for result in results:
+                contents.update(result)
+            return {key: contents[key] for key in keys}
+        
+        except Exception as e:
+            raise StorageError(f"Failed to retrieve data: {e}")
+    
+    def _read_files(self, keys: List[str]) -> Dict[str, bytes]:
+        """Read a group of files in key order (blocking; run in a thread)"""
+        contents = {}
+        for key in sorted(keys):
+            try:
+                contents[key] = (self.base_path / key).read_bytes()
+            except FileNotFoundError:
+                raise StorageError(f"File not found: {key}")
+        return contents
+    
+    async def open_stream(self, key: str) -> AsyncIterator[bytes]:
+        """Stream a file from local filesystem, one chunk in memory at a time"""
+        file_path = self.base_path / key
         
+        try:
+            f = await aiofiles.open(file_path, 'rb')
+        except FileNotFoundError:
+            raise StorageError(f"File not found: {key}")
         except Exception as e:
             raise StorageError(f"Failed to retrieve data: {e}")
+        
+        try:
+            while chunk := await f.read(_STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            await f.close()
+    
+    async def sendfile_to(self, key: str, out_fd: int) -> int:
+        """
+        Copy a stored file to a socket or file descriptor without user-space buffers
+        
+        Args:
+            key: Storage key
+            out_fd: Destination file descriptor (e.g. a connected socket)
+        
+        Returns:
+            Number of bytes sent
+        
+        Raises:
+            StorageError: If the file is missing or the copy fails
+        """
+        try:
+            return await asyncio.to_thread(self._sendfile, self.base_path / key, out_fd)
+        except FileNotFoundError:
+            raise StorageError(f"File not found: {key}")
+        except Exception as e:
+            raise StorageError(f"Failed to send data: {e}")
+    
+    @staticmethod
+    def _sendfile(file_path: Path, out_fd: int) -> int:
+        """Kernel-side copy of a whole file to out_fd (blocking; run in a thread)"""
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            sent = 0
+            while sent < size:
+                count = os.sendfile(out_fd, f.fileno(), sent, size - sent)
+                if count == 0:
+                    break
+                sent += count
+            return sent
     
     async def delete(self, key: str) -> bool:
         """Delete file from local filesystem"""
         try:
-            file_path = self.base_path / key
-            
-            if file_path.exists():
-                file_path.unlink()
-                
-                # Delete metadata if exists
-                metadata_path = file_path.with_suffix('.meta.json')
-                if metadata_path.exists():
-                    metadata_path.unlink()
-                
-                return True
-            
-            return False
+            return await asyncio.to_thread(self._delete_files, key)
         
         except Exception as e:
             raise StorageError(f"Failed to delete data: {e}")
     
+    def _delete_files(self, key: str) -> bool:
+        """Delete a file and its metadata (blocking; run in a thread)"""
+        file_path = self.base_path / key
+        if not file_path.exists():
+            return False
+        
+        file_path.unlink()
+        
+        # Delete metadata if exists (sidecar files predate the index)
+        with self._meta_lock:
+            self._meta_db.execute("DELETE FROM meta WHERE key = ?", (key,))
+        file_path.with_suffix('.meta.json').unlink(missing_ok=True)
+        
+        return True
+    
     async def exists(self, key: str) -> bool:
         """Check if file exists"""
         file_path = self.base_path / key
-        return file_path.exists()
+        return await asyncio.to_thread(file_path.exists)
     
     async def get_metadata(self, key: str) -> Dict[str, Any]:
         """Get file metadata"""
         try:
-            file_path = self.base_path / key
-            
-            if not file_path.exists():
+            try:
+                return await asyncio.to_thread(self._read_metadata, key)
+            except FileNotFoundError:
                 raise StorageError(f"File not found: {key}")
-            
-            # Try to load custom metadata
-            metadata_path = file_path.with_suffix('.meta.json')
-            if metadata_path.exists():
-                import json
-                return json.loads(metadata_path.read_text())
-            
-            # Return basic file info
-            stat = file_path.stat()
-            return {
-                "size": stat.st_size,
-                "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-            }
         
         except Exception as e:
             raise StorageError(f"Failed to get metadata: {e}")
+    
+    def _read_metadata(self, key: str) -> Dict[str, Any]:
+        """Load custom metadata or basic file info (blocking; run in a thread)"""
+        file_path = self.base_path / key
+        stat = file_path.stat()
+        
+        # Try to load custom metadata
+        metadata_json = self._get_metadata_row(key)
+        if metadata_json is not None:
+            return orjson.loads(metadata_json)
+        
+        # Sidecar files written before the metadata index
+        try:
+            return orjson.loads(file_path.with_suffix('.meta.json').read_bytes())
+        except FileNotFoundError:
+            pass
+        
+        # Return basic file info
+        return {
+            "size": stat.st_size,
+            "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
+            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        }
 
 
 class EvidenceStorage:
@@ -230,18 +496,30 @@ class EvidenceStorage:
     async def store_evidence(
         self,
         evidence_id: str,
-        content: bytes,
+        content: Union[bytes, AsyncIterable[bytes]],
         metadata: Optional[Dict[str, Any]] = None,
-        encrypt: Optional[bool] = None
+        encrypt: Optional[bool] = None,
+        data_key: Optional[bytes] = None,
+        key_id: Optional[str] = None,
+        bundle_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Store evidence with optional encryption
         
+        Encrypted or streamed content is written chunk by chunk, so large
+        evidence never needs a second full-size copy in memory.
+        
         Args:
             evidence_id: Unique evidence identifier
-            content: Evidence content
+            content: Evidence content, as bytes or an async stream of chunks
             metadata: Optional metadata
             encrypt: Whether to encrypt (uses default if None)
+            data_key: Shared data key to encrypt with; its owner (e.g. the
+                bundle manifest) holds the wrapped key. A fresh per-item key
+                is generated and wrapped if None.
+            key_id: Identifier of data_key
+            bundle_id: Bundle whose manifest holds the wrapped data_key;
+                recorded so the item can be decrypted on its own
         
         Returns:
             Storage info dict with URI and encryption details
@@ -249,76 +527,175 @@ class EvidenceStorage:
         should_encrypt = encrypt if encrypt is not None else self.encrypt_by_default
         
         storage_key = self._generate_storage_key(evidence_id)
-        stored_content = content
+        stream = None if isinstance(content, bytes) else content
         encryption_info = None
         
         if should_encrypt:
-            # Generate data key
-            data_key = self.crypto.generate_key(32)
-            
-            # Encrypt content
-            ciphertext, nonce = self.crypto.encrypt(content, data_key)
-            stored_content = ciphertext + nonce
-            
-            # Wrap data key with master key if available
             wrapped_key = None
-            if self.key_manager:
-                wrapped_key = self.key_manager.wrap_key(data_key)
+            if data_key is None:
+                # Generate data key
+                data_key = self.crypto.generate_key(32)
+                key_id = f"key_{evidence_id}"
+                
+                # Wrap data key with master key if available
+                if self.key_manager:
+                    wrapped_key = self.key_manager.wrap_key(data_key)
+            
+            # Encrypt content as it is written (nonce header, ciphertext, then tag)
+            stream = self.crypto.encrypt_stream(self._iter_chunks(content), data_key)
             
             encryption_info = {
                 "encrypted": True,
                 "algorithm": "AES-256-GCM",
+                "format": ENCRYPTION_FORMAT_NONCE_HEADER,
                 "wrapped_key": wrapped_key,
-                "key_id": f"key_{evidence_id}"
+                "key_id": key_id,
+                "bundle_id": bundle_id
             }
+            
+            # Record the encryption details with the object so reads know its layout
+            metadata = {**(metadata or {}), "encrypted": True, "encryption": encryption_info}
         
         # Store to backend
-        storage_uri = await self.backend.store(
-            storage_key,
-            stored_content,
-            metadata
-        )
+        if stream is None:
+            storage_uri = await self.backend.store(
+                storage_key,
+                content,
+                metadata
+            )
+            stored_size = len(content)
+        else:
+            stored_size = 0
+            
+            async def counted(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+                nonlocal stored_size
+                async for chunk in chunks:
+                    stored_size += len(chunk)
+                    yield chunk
+            
+            storage_uri = await self.backend.store_stream(
+                storage_key,
+                counted(stream),
+                metadata
+            )
         
         return {
             "evidence_id": evidence_id,
             "storage_uri": storage_uri,
             "storage_key": storage_key,
-            "size": len(stored_content),
+            "size": stored_size,
             "encrypted": should_encrypt,
             "encryption_info": encryption_info,
-            "stored_at": datetime.utcnow().isoformat()
+            "stored_at": _now_iso()
         }
     
+    @staticmethod
+    async def _iter_chunks(content: Union[bytes, AsyncIterable[bytes]]) -> AsyncIterator[bytes]:
+        """Yield content in chunks, slicing in-memory bytes without copying"""
+        if isinstance(content, bytes):
+            view = memoryview(content)
+            for offset in range(0, len(view), _STREAM_CHUNK_SIZE):
+                yield view[offset:offset + _STREAM_CHUNK_SIZE]
+        else:
+            async for chunk in content:
+                yield chunk
+    
     async def retrieve_evidence(
         self,
         evidence_id: str,
-        decrypt: bool = True
+        decrypt: bool = True,
+        data_key: Optional[bytes] = None
     ) -> bytes:
         """
         Retrieve evidence with optional decryption
         
+        Encrypted evidence is decrypted according to the layout recorded in
+        its metadata. The key is data_key if given, else the wrapped key
+        stored with the object, else the wrapped key in the manifest of the
+        bundle the object belongs to.
+        
         Args:
             evidence_id: Evidence identifier
             decrypt: Whether to decrypt if encrypted
+            data_key: Data key, e.g. a bundle key unwrapped from its manifest
         
         Returns:
             Evidence content
+        
+        Raises:
+            CryptoError: If no key is available or decryption fails
         """
         storage_key = self._generate_storage_key(evidence_id)
         
         # Retrieve from backend
-        stored_content = await self.backend.retrieve(storage_key)
+        try:
+            stored_content = await self.backend.retrieve(storage_key)
+        except StorageError:
+            storage_key = _legacy_storage_key(evidence_id)
+            if not await self.backend.exists(storage_key):
+                raise
+            stored_content = await self.backend.retrieve(storage_key)
         
         # Get metadata to check if encrypted
         metadata = await self.backend.get_metadata(storage_key)
         
         if decrypt and metadata.get('encrypted'):
-            # Would need to unwrap key and decrypt
-            # For now, return as-is
-            pass
+            encryption_info = metadata.get('encryption') or {}
+            if data_key is None:
+                data_key = self._unwrap(encryption_info.get('wrapped_key'))
+            if data_key is None and encryption_info.get('bundle_id'):
+                manifest = await self._load_manifest(encryption_info['bundle_id'])
+                data_key = self._unwrap((manifest.get('encryption') or {}).get('wrapped_key'))
+            
+            return self._decrypt_item(evidence_id, stored_content, encryption_info, data_key)
         
         return stored_content
     
+    def _unwrap(self, wrapped_key: Optional[str]) -> Optional[bytes]:
+        """Unwrap a stored data key, or None without one (or without a master key)"""
+        if not wrapped_key or not self.key_manager:
+            return None
+        return self.key_manager.unwrap_key(wrapped_key)
+    
+    def _decrypt_item(
+        self,
+        evidence_id: str,
+        stored_content: bytes,
+        encryption_info: Dict[str, Any],
+        data_key: Optional[bytes]
+    ) -> bytes:
+        """
+        Decrypt one stored item according to its recorded layout
+        
+        Raises:
+            CryptoError: If no key is available or decryption fails
+        """
+        if data_key is None:
+            raise CryptoError(f"No key available to decrypt evidence {evidence_id}")
+        
+        # Objects without a recorded format predate nonce framing
+        encryption_format = encryption_info.get('format', ENCRYPTION_FORMAT_TRAILING_NONCE)
+        try:
+            return self.crypto.decrypt_stored(stored_content, data_key, encryption_format)
+        except ValueError as e:
+            raise CryptoError(f"Cannot decrypt evidence {evidence_id}: {e}")
+    
+    async def stream_evidence(self, evidence_id: str) -> AsyncIterator[bytes]:
+        """
+        Stream stored evidence without loading it whole, e.g. for downloads
+        
+        Content is returned as stored (ciphertext for encrypted evidence).
+        
+        Args:
+            evidence_id: Evidence identifier
+        
+        Yields:
+            Content chunks
+        """
+        storage_key = await self._resolve_storage_key(evidence_id)
+        async for chunk in self.backend.open_stream(storage_key):
+            yield chunk
+    
     async def delete_evidence(self, evidence_id: str) -> bool:
         """
         Delete stored evidence
@@ -330,7 +707,10 @@ class EvidenceStorage:
             True if deleted
         """
         storage_key = self._generate_storage_key(evidence_id)
-        return await self.backend.delete(storage_key)
+        return (
+            await self.backend.delete(storage_key)
+            or await self.backend.delete(_legacy_storage_key(evidence_id))
+        )
     
     async def exists(self, evidence_id: str) -> bool:
         """
@@ -343,7 +723,10 @@ class EvidenceStorage:
             True if exists
         """
         storage_key = self._generate_storage_key(evidence_id)
-        return await self.backend.exists(storage_key)
+        return (
+            await self.backend.exists(storage_key)
+            or await self.backend.exists(_legacy_storage_key(evidence_id))
+        )
     
     async def store_bundle(
         self,
@@ -354,6 +737,9 @@ class EvidenceStorage:
         """
         Store multiple evidence items as a bundle
         
+        When encrypting, every item is sealed under one bundle data key
+        (each with its own nonce), wrapped once in the manifest.
+        
         Args:
             bundle_id: Bundle identifier
             evidence_items: Dict of evidence_id -> content
@@ -362,30 +748,48 @@ class EvidenceStorage:
         Returns:
             Bundle storage info
         """
-        stored_items = []
+        should_encrypt = self.encrypt_by_default
+        data_key = None
+        key_id = None
+        bundle_encryption = None
+        
+        if should_encrypt:
+            data_key = self.crypto.generate_key(32)
+            key_id = f"key_{bundle_id}"
+            bundle_encryption = {
+                "algorithm": "AES-256-GCM",
+                "wrapped_key": self.key_manager.wrap_key(data_key) if self.key_manager else None,
+                "key_id": key_id
+            }
         
-        for evidence_id, content in evidence_items.items():
-            storage_info = await self.store_evidence(
+        semaphore = asyncio.Semaphore(_BUNDLE_IO_CONCURRENCY)
+        stored_items = list(await asyncio.gather(*(
+            self._bounded(semaphore, self.store_evidence(
                 evidence_id,
                 content,
-                metadata
-            )
-            stored_items.append(storage_info)
+                metadata,
+                encrypt=should_encrypt,
+                data_key=data_key,
+                key_id=key_id,
+                bundle_id=bundle_id if should_encrypt else None
+            ))
+            for evidence_id, content in evidence_items.items()
+        )))
         
         # Store bundle manifest
         bundle_manifest = {
             "bundle_id": bundle_id,
             "evidence_count": len(evidence_items),
             "items": stored_items,
+            "encryption": bundle_encryption,
             "metadata": metadata or {},
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": _now_iso()
         }
         
-        import json
         manifest_key = f"bundles/{bundle_id}/manifest.json"
         await self.backend.store(
             manifest_key,
-            json.dumps(bundle_manifest).encode('utf-8')
+            orjson.dumps(bundle_manifest)
         )
         
         return bundle_manifest
@@ -394,27 +798,52 @@ class EvidenceStorage:
         """
         Retrieve all evidence in a bundle
         
+        Items are fetched with one backend mget; encrypted items are
+        decrypted with the bundle key, unwrapped once from the manifest
+        (or with their own wrapped key, for bundles stored with per-item keys).
+        
         Args:
             bundle_id: Bundle identifier
         
         Returns:
             Dict of evidence_id -> content
+        
+        Raises:
+            CryptoError: If an encrypted item has no usable key or fails to decrypt
         """
         # Load manifest
-        manifest_key = f"bundles/{bundle_id}/manifest.json"
-        manifest_data = await self.backend.retrieve(manifest_key)
-        
-        import json
-        manifest = json.loads(manifest_data.decode('utf-8'))
+        manifest = await self._load_manifest(bundle_id)
         
         # Retrieve all items
-        evidence_items = {}
-        for item in manifest['items']:
-            evidence_id = item['evidence_id']
-            content = await self.retrieve_evidence(evidence_id)
-            evidence_items[evidence_id] = content
-        
-        return evidence_items
+        # Manifests record each item's key, so older bundles keep their layout
+        storage_keys = [
+            item.get('storage_key') or self._generate_storage_key(item['evidence_id'])
+            for item in manifest['items']
+        ]
+        contents = await self.backend.mget(storage_keys)
+        
+        bundle_key = self._unwrap((manifest.get('encryption') or {}).get('wrapped_key'))
+        result = {}
+        for item, storage_key in zip(manifest['items'], storage_keys):
+            content = contents[storage_key]
+            encryption_info = item.get('encryption_info')
+            if item.get('encrypted') and encryption_info:
+                data_key = bundle_key or self._unwrap(encryption_info.get('wrapped_key'))
+                content = self._decrypt_item(item['evidence_id'], content, encryption_info, data_key)
+            result[item['evidence_id']] = content
+        
+        return result
+    
+    async def _load_manifest(self, bundle_id: str) -> Dict[str, Any]:
+        """Load a bundle manifest"""
+        manifest_key = f"bundles/{bundle_id}/manifest.json"
+        return orjson.loads(await self.backend.retrieve(manifest_key))
+    
+    @staticmethod
+    async def _bounded(semaphore: asyncio.Semaphore, operation: Awaitable[Any]) -> Any:
+        """Await an operation once the bundle's concurrency limit allows"""
+        async with semaphore:
+            return await operation
     
     def _generate_storage_key(self, evidence_id: str) -> str:
         """
@@ -426,16 +855,16 @@ class EvidenceStorage:
         Returns:
             Storage key path
         """
-        # Create hierarchical path based on ID
-        # e.g., github:log:abc123 -> evidence/github/log/abc123.bin
-        parts = evidence_id.split(':')
-        
-        if len(parts) >= 2:
-            source = parts[0]
-            type_or_hash = '/'.join(parts[1:])
-            return f"evidence/{source}/{type_or_hash}.bin"
-        else:
-            return f"evidence/{evidence_id}.bin"
+        return _storage_key(evidence_id)
+    
+    async def _resolve_storage_key(self, evidence_id: str) -> str:
+        """Storage key of existing evidence, falling back to the unsharded layout"""
+        storage_key = self._generate_storage_key(evidence_id)
+        if not await self.backend.exists(storage_key):
+            legacy_key = _legacy_storage_key(evidence_id)
+            if await self.backend.exists(legacy_key):
+                return legacy_key
+        return storage_key
     
     @staticmethod
     def get_backend(backend_type: StorageBackendType) -> StorageBackend:
@@ -3,18 +3,35 @@ ZKP Circuit Manager
 Manages circuit templates, compilation, and circuit lifecycle
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, FrozenSet, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
 import json
 import hashlib
-from pydantic import BaseModel, Field
+import sqlite3
+import threading
+from pydantic import BaseModel, Field, PrivateAttr
 
 from app.utils.errors import ValidationError, NotFoundError
 from app.config import settings
 
 
+# Same output as json.dumps(..., sort_keys=True); template hashes depend on it
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True)
+
+# Single row store holding every persisted template in the circuits directory
+_TEMPLATE_DB_NAME = "templates.db"
+
+# Type checks for input_schema entries; unknown schema types accept any value
+_INPUT_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "field": lambda v: isinstance(v, (int, str)),
+    "bool": lambda v: isinstance(v, bool),
+    "array": lambda v: isinstance(v, list),
+    "hash": lambda v: isinstance(v, str) and len(v) == 64,  # SHA-256
+}
+
+
 class CircuitType(str, Enum):
     """Supported circuit types"""
     MERKLE_PROOF = "merkle_proof"
@@ -57,15 +74,38 @@ class CircuitTemplate(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    # (template_id, version, id(input_schema)) -> hash, from the last compute_hash
+    _hash_cache: Optional[Tuple[Tuple[str, str, int], str]] = PrivateAttr(default=None)
+    
+    # (id(public_inputs), id(private_inputs)) -> required input names
+    _required_cache: Optional[Tuple[Tuple[int, int], FrozenSet[str]]] = PrivateAttr(default=None)
     
     def compute_hash(self) -> str:
         """Compute hash of circuit template for integrity checking"""
-        content = f"{self.template_id}{self.version}{json.dumps(self.input_schema, sort_keys=True)}"
-        return hashlib.sha256(content.encode()).hexdigest()
+        key = (self.template_id, self.version, id(self.input_schema))
+        if self._hash_cache is not None and self._hash_cache[0] == key:
+            return self._hash_cache[1]
+        
+        # Feed the parts straight into the digest instead of joining them first
+        digest = hashlib.sha256(self.template_id.encode())
+        digest.update(self.version.encode())
+        digest.update(_CANONICAL_ENCODER.encode(self.input_schema).encode())
+        template_hash = digest.hexdigest()
+        self._hash_cache = (key, template_hash)
+        return template_hash
+    
+    @property
+    def required_inputs(self) -> FrozenSet[str]:
+        """Names of all public and private inputs"""
+        key = (id(self.public_inputs), id(self.private_inputs))
+        if self._required_cache is None or self._required_cache[0] != key:
+            self._required_cache = (key, frozenset(self.public_inputs) | frozenset(self.private_inputs))
+        return self._required_cache[1]
+    
+    def invalidate_caches(self):
+        """Drop memoized values, e.g. after editing input lists or schema in place"""
+        self._hash_cache = None
+        self._required_cache = None
 
 
 class CircuitManager:
@@ -86,8 +126,17 @@ class CircuitManager:
         # In-memory cache of templates
         self._templates: Dict[str, CircuitTemplate] = {}
         
+        # Persisted templates live in one table, rehydrated with a single query;
+        # the connection is shared by worker threads, serialized by the lock
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(self.circuits_path / _TEMPLATE_DB_NAME, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS templates (id TEXT PRIMARY KEY, version TEXT NOT NULL, json BLOB NOT NULL)"
+        )
+        
         # Load built-in templates
         self._load_builtin_templates()
+        self._load_stored_templates()
     
     def register_template(self, template: CircuitTemplate) -> CircuitTemplate:
         """
@@ -187,6 +236,7 @@ class CircuitManager:
         for key, value in updates.items():
             if hasattr(template, key):
                 setattr(template, key, value)
+        template.invalidate_caches()
         
         template.updated_at = datetime.utcnow()
         
@@ -292,10 +342,7 @@ class CircuitManager:
         template = self.get_template(template_id)
         
         # Check all required inputs are provided
-        all_inputs = set(template.public_inputs + template.private_inputs)
-        provided_inputs = set(inputs.keys())
-        
-        missing = all_inputs - provided_inputs
+        missing = template.required_inputs - inputs.keys()
         if missing:
             raise ValidationError(f"Missing required inputs: {missing}")
         
@@ -314,16 +361,8 @@ class CircuitManager:
     
     def _validate_input_type(self, value: Any, expected_type: Any) -> bool:
         """Validate input type matches expected type"""
-        if expected_type == "field":
-            return isinstance(value, (int, str))
-        elif expected_type == "bool":
-            return isinstance(value, bool)
-        elif expected_type == "array":
-            return isinstance(value, list)
-        elif expected_type == "hash":
-            return isinstance(value, str) and len(value) == 64  # SHA-256
-        else:
-            return True  # Accept any type for unknown types
+        check = _INPUT_TYPE_CHECKS.get(expected_type)
+        return check is None or check(value)  # Accept any type for unknown types
     
     def _load_builtin_templates(self):
         """Load built-in circuit templates"""
@@ -400,18 +439,35 @@ class CircuitManager:
         }
     
     def _save_template(self, template: CircuitTemplate):
-        """Save template to disk"""
-        template_file = self.circuits_path / f"{template.template_id}.json"
-        template_file.write_text(template.json(indent=2))
+        """Upsert the template row"""
+        with self._db_lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO templates (id, version, json) VALUES (?, ?, ?)",
+                (template.template_id, template.version, template.model_dump_json())
+            )
+    
+    def _load_stored_templates(self):
+        """Rehydrate persisted templates; built-ins already in memory take precedence"""
+        with self._db_lock:
+            rows = self._db.execute("SELECT json FROM templates").fetchall()
+        
+        for (template_json,) in rows:
+            template = CircuitTemplate.model_validate_json(template_json)
+            self._templates.setdefault(template.template_id, template)
     
     def _load_template(self, template_id: str) -> Optional[CircuitTemplate]:
         """Load template from disk"""
-        template_file = self.circuits_path / f"{template_id}.json"
-        
-        if template_file.exists():
-            return CircuitTemplate.parse_raw(template_file.read_text())
+        with self._db_lock:
+            row = self._db.execute("SELECT json FROM templates WHERE id = ?", (template_id,)).fetchone()
+        if row is not None:
+            return CircuitTemplate.model_validate_json(row[0])
         
-        return None
+        # Per-template files written before the template table
+        template_file = self.circuits_path / f"{template_id}.json"
+        try:
+            return CircuitTemplate.model_validate_json(template_file.read_bytes())
+        except FileNotFoundError:
+            return None
     
     def get_circuit_statistics(self) -> Dict[str, Any]:
         """Get statistics about registered circuits"""
@@ -8,13 +8,29 @@ from datetime import datetime
 from pydantic import BaseModel, Field
 import json
 import hashlib
+import logging
+import secrets
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+import os
 
 from app.core.zkp.circuit_manager import CircuitManager, CircuitTemplate
 from app.core.zkp.witness_builder import WitnessData
 from app.utils.errors import ProofGenerationError, ValidationError
 from app.utils.crypto import HashUtils
 
+logger = logging.getLogger(__name__)
+
+
+# Same output as json.dumps(..., sort_keys=True); proof hashes depend on it
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True)
+
+
+def _encode_proof_data(proof_data: Dict[str, Any]) -> bytes:
+    """Canonical proof encoding, hashed for proof_hash and measured for proof_size"""
+    return _CANONICAL_ENCODER.encode(proof_data).encode()
+
 
 class ProofArtifact(BaseModel):
     """
@@ -46,8 +62,7 @@ class ProofArtifact(BaseModel):
     
     def compute_proof_hash(self) -> str:
         """Compute hash of proof data"""
-        proof_str = json.dumps(self.proof_data, sort_keys=True)
-        return hashlib.sha256(proof_str.encode()).hexdigest()
+        return hashlib.sha256(_encode_proof_data(self.proof_data)).hexdigest()
 
 
 class ProofGenerator:
@@ -125,8 +140,10 @@ class ProofGenerator:
         end_time = datetime.utcnow()
         proving_time = (end_time - start_time).total_seconds()
         
-        # Create proof artifact
+        # Create proof artifact; key order doesn't change the encoded size,
+        # so one canonical encoding serves both size and hash
         proof_id = self._generate_proof_id(claim_id or witness.claim_id, template_id)
+        proof_blob = _encode_proof_data(proof_data)
         
         artifact = ProofArtifact(
             proof_id=proof_id,
@@ -136,8 +153,8 @@ class ProofGenerator:
             proof_data=proof_data,
             public_inputs=witness.public_inputs,
             proving_time=proving_time,
-            proof_size=len(json.dumps(proof_data)),
-            proof_hash=hashlib.sha256(json.dumps(proof_data, sort_keys=True).encode()).hexdigest(),
+            proof_size=len(proof_blob),
+            proof_hash=hashlib.sha256(proof_blob).hexdigest(),
             verification_key_hash=self._hash_verification_key(template)
         )
         
@@ -149,30 +166,40 @@ class ProofGenerator:
     def generate_batch_proofs(
         self,
         witnesses: list[WitnessData],
-        template_id: str
+        template_id: str,
+        max_workers: Optional[int] = None
     ) -> list[ProofArtifact]:
         """
         Generate multiple proofs in batch
         
+        Witnesses are independent, so proofs are generated on a thread
+        pool; native provers release the GIL while proving.
+        
         Args:
             witnesses: List of witness data
             template_id: Circuit template to use
+            max_workers: Maximum worker threads (defaults to the CPU count)
         
         Returns:
-            List of generated proof artifacts
+            List of generated proof artifacts, in witness order
         """
-        proofs = []
+        if not witnesses:
+            return []
         
-        for witness in witnesses:
-            try:
-                proof = self.generate_proof(witness, template_id)
-                proofs.append(proof)
-            except Exception as e:
-                # Log error but continue with other proofs
-                print(f"Failed to generate proof for claim {witness.claim_id}: {e}")
-                continue
+        workers = min(max_workers or os.cpu_count() or 1, len(witnesses))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            proofs = list(executor.map(self._try_generate_proof, witnesses, repeat(template_id)))
         
-        return proofs
+        return [proof for proof in proofs if proof is not None]
+    
+    def _try_generate_proof(self, witness: WitnessData, template_id: str) -> Optional[ProofArtifact]:
+        """Generate one batch proof, logging and skipping failures"""
+        try:
+            return self.generate_proof(witness, template_id)
+        except Exception as e:
+            # Log error but continue with other proofs
+            logger.error(f"Failed to generate proof for claim {witness.claim_id}: {e}")
+            return None
     
     def _generate_proof_internal(
         self,
@@ -265,9 +292,12 @@ class ProofGenerator:
     
     def _generate_proof_id(self, claim_id: str, template_id: str) -> str:
         """Generate unique proof ID"""
+        # The random component keeps IDs distinct when batch workers prove
+        # the same claim within one clock tick
         timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
-        content = f"{claim_id}:{template_id}:{timestamp}"
-        hash_suffix = hashlib.sha256(content.encode()).hexdigest()[:8]
+        content = f"{claim_id}:{template_id}:{timestamp}:{secrets.token_hex(8)}"
+        # Only 4 bytes of the digest are used, so hex-encode just those
+        hash_suffix = hashlib.sha256(content.encode()).digest()[:4].hex()
         return f"proof_{claim_id}_{template_id}_{hash_suffix}"
     
     def _hash_verification_key(self, template: CircuitTemplate) -> Optional[str]:
@@ -7,7 +7,6 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from pathlib import Path
 
 from app.core.attestation.package_builder import (
     AttestationPackageBuilder,
@@ -109,7 +108,7 @@ class AttestationService:
             title=title,
             description=description,
             status=package.status.value,
-            package_data=package.dict()
+            package_data=package.model_dump()
         )
         
         self.db.add(package_model)
@@ -290,18 +289,7 @@ class AttestationService:
             raise ValidationError("Package is not signed")
         
         # Load signature
-        # Find signature by package hash
-        signature = None
-        signatures_path = Path("./keys")
-        for sig_file in signatures_path.glob("*.json"):
-            try:
-                from app.core.attestation.signature_manager import DigitalSignature
-                sig = DigitalSignature.parse_raw(sig_file.read_text())
-                if sig.package_id == package_id:
-                    signature = sig
-                    break
-            except:
-                continue
+        signature = self.signature_manager.find_signature(package_id)
         
         if not signature:
             raise NotFoundError("Signature not found")
@@ -575,5 +563,5 @@ class AttestationService:
         
         if package_model:
             package_model.status = package.status.value
-            package_model.package_data = package.dict()
+            package_model.package_data = package.model_dump()
             await self.db.commit()
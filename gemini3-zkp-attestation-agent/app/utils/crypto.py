@@ -5,7 +5,8 @@ Encryption, decryption, hashing, and key management
 
 import hashlib
 import secrets
-from typing import Tuple, Optional
+from typing import AsyncIterable, AsyncIterator, Tuple, Optional
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -15,6 +16,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Layouts of stored AES-GCM blobs, recorded as "format" in encryption info
+ENCRYPTION_FORMAT_TRAILING_NONCE = 1  # ciphertext | tag | nonce, as written before nonce framing
+ENCRYPTION_FORMAT_NONCE_HEADER = 2  # nonce | ciphertext | tag, as written by encrypt_stream()
+
 
 class CryptoUtils:
     """
@@ -81,6 +86,81 @@ class CryptoUtils:
         
         return ciphertext, nonce
     
+    @staticmethod
+    async def encrypt_stream(chunks: AsyncIterable[bytes], key: bytes) -> AsyncIterator[bytes]:
+        """
+        Encrypt a stream of chunks using AES-256-GCM
+        
+        Only one chunk is held at a time. The concatenated output is framed
+        as nonce, ciphertext, then tag (the nonce-first layout used by
+        encrypt_to_string), so no buffer is ever re-joined; read it back
+        with decrypt_framed().
+        
+        Args:
+            chunks: Plaintext chunks
+            key: 32-byte encryption key
+            
+        Yields:
+            The nonce header, ciphertext chunks, then the tag
+        """
+        if len(key) != 32:
+            raise ValueError("Key must be 32 bytes for AES-256")
+        
+        nonce = secrets.token_bytes(12)  # 96-bit nonce for GCM
+        encryptor = Cipher(algorithms.AES(key), modes.GCM(nonce)).encryptor()
+        yield nonce
+        
+        async for chunk in chunks:
+            ciphertext = encryptor.update(chunk)
+            if ciphertext:
+                yield ciphertext
+        
+        final = encryptor.finalize()
+        if final:
+            yield final
+        yield encryptor.tag
+    
+    @staticmethod
+    def decrypt_framed(framed: bytes, key: bytes) -> bytes:
+        """
+        Decrypt nonce-framed data produced by encrypt_stream()
+        
+        Args:
+            framed: 12-byte nonce followed by ciphertext and tag
+            key: 32-byte encryption key
+            
+        Returns:
+            Decrypted data
+            
+        Raises:
+            ValueError: If decryption fails (wrong key or tampered data)
+        """
+        view = memoryview(framed)
+        return CryptoUtils.decrypt(view[12:], key, view[:12])
+    
+    @staticmethod
+    def decrypt_stored(data: bytes, key: bytes, encryption_format: int) -> bytes:
+        """
+        Decrypt a stored blob according to its recorded layout
+        
+        Args:
+            data: Stored encrypted blob
+            key: 32-byte encryption key
+            encryption_format: ENCRYPTION_FORMAT_* layout of data
+            
+        Returns:
+            Decrypted data
+            
+        Raises:
+            ValueError: If the format is unknown or decryption fails
+        """
+        if encryption_format == ENCRYPTION_FORMAT_NONCE_HEADER:
+            return CryptoUtils.decrypt_framed(data, key)
+        if encryption_format == ENCRYPTION_FORMAT_TRAILING_NONCE:
+            view = memoryview(data)
+            return CryptoUtils.decrypt(view[:-12], key, view[-12:])
+        raise ValueError(f"Unknown encryption format: {encryption_format}")
+    
     @staticmethod
     def decrypt(ciphertext: bytes, key: bytes, nonce: bytes) -> bytes:
         """
@@ -162,6 +242,19 @@ class HashUtils:
         """
         return hashlib.sha256(data).hexdigest()
     
+    @staticmethod
+    def sha256_raw(data: bytes) -> bytes:
+        """
+        Generate SHA-256 hash as raw bytes
+        
+        Args:
+            data: Data to hash
+            
+        Returns:
+            32-byte digest
+        """
+        return hashlib.sha256(data).digest()
+    
     @staticmethod
     def sha256_file(file_path: str, chunk_size: int = 8192) -> str:
         """
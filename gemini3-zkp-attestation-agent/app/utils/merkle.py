@@ -4,12 +4,21 @@ For creating cryptographic commitments to evidence bundles
 """
 
 import hashlib
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# hashlib constructors by algorithm name, resolved once per tree
+_HASH_CONSTRUCTORS = {
+    "SHA256": hashlib.sha256,
+    "SHA512": hashlib.sha512,
+    "SHA384": hashlib.sha384,
+    "SHA224": hashlib.sha224,
+    "SHA1": hashlib.sha1,
+}
+
 
 class MerkleNode:
     """
@@ -45,10 +54,13 @@ class MerkleTree:
         self.root: Optional[MerkleNode] = None
         self.leaves: List[str] = []
         self._validate_algorithm()
+        self._hash_fn = _HASH_CONSTRUCTORS[self.hash_algorithm]
+        # Every level of the last built tree, leaves first
+        self._levels: List[List[str]] = []
     
     def _validate_algorithm(self):
         """Validate hash algorithm is supported"""
-        supported = ["SHA256", "SHA512", "SHA384", "SHA224", "SHA1"]
+        supported = list(_HASH_CONSTRUCTORS)
         if self.hash_algorithm not in supported:
             raise ValueError(f"Unsupported hash algorithm: {self.hash_algorithm}. Supported: {supported}")
     
@@ -62,18 +74,7 @@ class MerkleTree:
         Returns:
             Hex-encoded hash
         """
-        if self.hash_algorithm == "SHA256":
-            return hashlib.sha256(data).hexdigest()
-        elif self.hash_algorithm == "SHA512":
-            return hashlib.sha512(data).hexdigest()
-        elif self.hash_algorithm == "SHA384":
-            return hashlib.sha384(data).hexdigest()
-        elif self.hash_algorithm == "SHA224":
-            return hashlib.sha224(data).hexdigest()
-        elif self.hash_algorithm == "SHA1":
-            return hashlib.sha1(data).hexdigest()
-        else:
-            raise ValueError(f"Unsupported algorithm: {self.hash_algorithm}")
+        return self._hash_fn(data).hexdigest()
     
     def _hash_pair(self, left: str, right: str) -> str:
         """
@@ -128,33 +129,133 @@ class MerkleTree:
         if not self.leaves:
             raise ValueError("Cannot build tree with no leaves")
         
-        # Start with leaf nodes
-        nodes = [MerkleNode(leaf_hash) for leaf_hash in self.leaves]
+        self._levels = self._compute_levels(self.leaves)
+        self.root = MerkleNode(self._levels[-1][0])
+        logger.info(f"Built Merkle tree with {len(self.leaves)} leaves, root: {self.root.hash[:16]}...")
+        return self.root.hash
+    
+    def _compute_levels(self, leaves: List[str]) -> List[List[str]]:
+        """
+        Hash a tree level by level, without per-node objects
+        
+        An odd node at the end of a level is paired with itself.
         
-        # Build tree bottom-up
-        while len(nodes) > 1:
-            next_level = []
+        Args:
+            leaves: Leaf hashes
             
-            # Process pairs of nodes
-            for i in range(0, len(nodes), 2):
-                left = nodes[i]
-                
-                # If odd number of nodes, duplicate the last one
-                if i + 1 < len(nodes):
-                    right = nodes[i + 1]
-                else:
-                    right = nodes[i]
-                
-                # Create parent node
-                parent_hash = self._hash_pair(left.hash, right.hash)
-                parent = MerkleNode(parent_hash, left, right)
-                next_level.append(parent)
+        Returns:
+            All levels, from a copy of the leaves up to the single root
+        """
+        level = list(leaves)
+        levels = [level]
+        
+        while len(level) > 1:
+            level = self.hash_layer(level)
+            levels.append(level)
+        
+        return levels
+    
+    def hash_layer(self, level: List[str]) -> List[str]:
+        """
+        Hash a whole tree level into its parent level
+        
+        Args:
+            level: Node hashes of one level, left to right; an odd last
+                node is paired with itself
             
-            nodes = next_level
+        Returns:
+            Parent level hashes
+        """
+        if len(level) % 2:
+            level = level + [level[-1]]
         
-        self.root = nodes[0]
-        logger.info(f"Built Merkle tree with {len(self.leaves)} leaves, root: {self.root.hash[:16]}...")
-        return self.root.hash
+        hash_fn = self._hash_fn
+        return [
+            hash_fn((level[i] + level[i + 1]).encode('utf-8')).hexdigest()
+            for i in range(0, len(level), 2)
+        ]
+    
+    def get_frontier(self) -> List[Optional[str]]:
+        """
+        Get the right-edge frontier of the built tree
+        
+        With n leaves, entry l is the node at index n // 2**l - 1 of level l
+        when n // 2**l is odd, and None otherwise. These are the only
+        existing nodes needed to append leaves (see extend_frontier).
+        
+        Returns:
+            Frontier nodes, one entry per bit of the leaf count
+            
+        Raises:
+            ValueError: If tree not built
+        """
+        if not self.root:
+            raise ValueError("Tree must be built before taking its frontier")
+        
+        levels = self._levels
+        leaf_count = len(levels[0])
+        frontier = []
+        for level in range(leaf_count.bit_length()):
+            count = leaf_count >> level
+            frontier.append(levels[level][count - 1] if count & 1 else None)
+        
+        return frontier
+    
+    def extend_frontier(
+        self,
+        frontier: List[Optional[str]],
+        leaf_count: int,
+        new_leaves: List[str]
+    ) -> Tuple[str, List[Optional[str]]]:
+        """
+        Compute the root after appending leaves, from the frontier alone
+        
+        Only the right edge of each level is rehashed (O(k + log n) hashes
+        for k new leaves); the result equals rebuilding the whole tree
+        from all leaves.
+        
+        Args:
+            frontier: Frontier of the existing tree (get_frontier)
+            leaf_count: Number of leaves in the existing tree
+            new_leaves: Leaf hashes to append
+            
+        Returns:
+            Tuple of (new root, new frontier)
+            
+        Raises:
+            ValueError: If there is nothing to append
+        """
+        if not new_leaves or leaf_count < 1:
+            raise ValueError("Extending a tree requires existing and new leaves")
+        
+        total = leaf_count + len(new_leaves)
+        
+        # part holds the nodes of the current level from index start onward;
+        # everything left of start is unchanged by the append
+        part = list(new_leaves)
+        start = leaf_count
+        length = total
+        new_frontier = []
+        level = 0
+        
+        while True:
+            count = total >> level
+            if count & 1:
+                index = count - 1
+                new_frontier.append(part[index - start] if index >= start else frontier[level])
+            elif count:
+                new_frontier.append(None)
+            
+            if length == 1:
+                return part[0], new_frontier
+            
+            # Rehash the changed right edge as one layer, starting from an
+            # even index (the frontier node supplies the left sibling when
+            # start is odd); it runs to the end of the level
+            nodes = part if start % 2 == 0 else [frontier[level]] + part
+            
+            part, start, length = self.hash_layer(nodes), start >> 1, (length + 1) >> 1
+            level += 1
     
     def get_root(self) -> Optional[str]:
         """
@@ -184,40 +285,35 @@ class MerkleTree:
         if leaf_index < 0 or leaf_index >= len(self.leaves):
             raise ValueError(f"Invalid leaf index: {leaf_index}")
         
+        # Reuse the levels from build() unless leaves changed since
+        levels = self._levels
+        if not levels or levels[0] != self.leaves:
+            levels = self._compute_levels(self.leaves)
+        
         proof = []
-        nodes = [MerkleNode(leaf_hash) for leaf_hash in self.leaves]
         current_index = leaf_index
         
-        # Build proof bottom-up
-        while len(nodes) > 1:
-            next_level = []
-            
-            for i in range(0, len(nodes), 2):
-                left = nodes[i]
-                right = nodes[i + 1] if i + 1 < len(nodes) else nodes[i]
-                
-                # If this is the path we're proving
-                if i == current_index or i + 1 == current_index:
-                    if current_index == i:
-                        # We're on the left, record right sibling
-                        proof.append({
-                            "position": "right",
-                            "hash": right.hash
-                        })
-                    else:
-                        # We're on the right, record left sibling
-                        proof.append({
-                            "position": "left",
-                            "hash": left.hash
-                        })
-                
-                parent_hash = self._hash_pair(left.hash, right.hash)
-                parent = MerkleNode(parent_hash, left, right)
-                next_level.append(parent)
+        # Walk the path bottom-up, recording each sibling
+        for level in levels[:-1]:
+            if current_index % 2 == 0:
+                # We're on the left, record right sibling (the node itself
+                # when it is the odd one out)
+                sibling_index = current_index + 1
+                if sibling_index == len(level):
+                    sibling_index = current_index
+                proof.append({
+                    "position": "right",
+                    "hash": level[sibling_index]
+                })
+            else:
+                # We're on the right, record left sibling
+                proof.append({
+                    "position": "left",
+                    "hash": level[current_index - 1]
+                })
             
             # Move up to parent level
             current_index = current_index // 2
-            nodes = next_level
         
         return proof
     
@@ -318,6 +414,27 @@ def create_merkle_tree_from_hashes(hashes: List[str], hash_algorithm: str = "SHA
     return tree
 
 
+def extend_merkle_frontier(
+    frontier: List[Optional[str]],
+    leaf_count: int,
+    new_leaves: List[str],
+    hash_algorithm: str = "SHA256"
+) -> Tuple[str, List[Optional[str]]]:
+    """
+    Compute the Merkle root and frontier after appending leaves
+    
+    Args:
+        frontier: Frontier of the existing tree
+        leaf_count: Number of leaves in the existing tree
+        new_leaves: Leaf hashes to append
+        hash_algorithm: Hash algorithm to use
+        
+    Returns:
+        Tuple of (new root, new frontier)
+    """
+    return MerkleTree(hash_algorithm=hash_algorithm).extend_frontier(frontier, leaf_count, new_leaves)
+
+
 def create_merkle_tree_from_evidence(evidence_items: List[Dict[str, Any]], hash_algorithm: str = "SHA256") -> MerkleTree:
     """
     Create a Merkle tree from evidence items
@@ -0,0 +1,97 @@
+"""
+Test evidence commitment formats
+Round-trips the compact serialization and checks incremental (frontier)
+updates against a full rebuild
+"""
+
+import hashlib
+import os
+import types
+
+import orjson
+import pytest
+
+from app.core.evidence.commitment import CommitmentGenerator
+from app.utils.errors import ValidationError
+
+
+def make_evidence(count):
+    return [
+        types.SimpleNamespace(content_hash=hashlib.sha256(os.urandom(16)).hexdigest())
+        for _ in range(count)
+    ]
+
+
+@pytest.fixture
+def generator():
+    return CommitmentGenerator()
+
+
+@pytest.mark.parametrize("count", [1, 2, 5, 16])
+def test_compact_round_trip(generator, count):
+    evidence = make_evidence(count)
+    commitment = generator.generate_commitment(evidence, "bundle1")
+    
+    data = generator.serialize_commitment_compact(commitment)
+    restored = generator.deserialize_commitment_compact(data)
+    
+    assert "evidence_hashes_packed" in orjson.loads(data)
+    assert restored.merkle_root == commitment.merkle_root
+    assert restored.evidence_count == count
+    assert list(restored.evidence_hashes) == [item.content_hash for item in evidence]
+    assert generator.generate_proof(restored, count - 1) == generator.generate_proof(commitment, count - 1)
+
+
+def test_compact_reads_hex_list(generator):
+    """Compact data carrying a plain hex list (e.g. regular JSON output) still loads"""
+    evidence = make_evidence(3)
+    commitment = generator.generate_commitment(evidence, "bundle1")
+    
+    restored = generator.deserialize_commitment_compact(generator.serialize_commitment(commitment).encode())
+    
+    assert list(restored.evidence_hashes) == [item.content_hash for item in evidence]
+    assert restored.merkle_root == commitment.merkle_root
+
+
+def test_compact_rejects_count_mismatch(generator):
+    commitment = generator.generate_commitment(make_evidence(4), "bundle1")
+    fields = orjson.loads(generator.serialize_commitment_compact(commitment))
+    fields["evidence_count"] = 3
+    
+    with pytest.raises(ValidationError):
+        generator.deserialize_commitment_compact(orjson.dumps(fields))
+    
+    fields = orjson.loads(generator.serialize_commitment(commitment))
+    fields["evidence_count"] = 5
+    
+    with pytest.raises(ValidationError):
+        generator.deserialize_commitment_compact(orjson.dumps(fields))
+
+
+def test_compact_rejects_partial_digest(generator):
+    commitment = generator.generate_commitment(make_evidence(2), "bundle1")
+    fields = orjson.loads(generator.serialize_commitment_compact(commitment))
+    fields["evidence_hashes_packed"] = fields["evidence_hashes_packed"][:-8]
+    
+    with pytest.raises(ValidationError):
+        generator.deserialize_commitment_compact(orjson.dumps(fields))
+
+
+@pytest.mark.parametrize("existing,added", [(1, 1), (3, 2), (4, 4), (7, 9), (16, 1)])
+def test_update_matches_full_rebuild(generator, existing, added):
+    """Extending the cached tree frontier gives the same root and proofs as rebuilding"""
+    evidence = make_evidence(existing)
+    new_evidence = make_evidence(added)
+    commitment = generator.generate_commitment(evidence, "bundle1")
+    
+    updated = generator.update_commitment(commitment, new_evidence)
+    rebuilt = CommitmentGenerator().generate_commitment(evidence + new_evidence, "bundle1")
+    
+    assert updated.merkle_root == rebuilt.merkle_root
+    assert updated.evidence_count == existing + added
+    assert list(updated.evidence_hashes) == list(rebuilt.evidence_hashes)
+    for index in (0, existing - 1, existing + added - 1):
+        assert generator.generate_proof(updated, index)["proof"] == generator.generate_proof(rebuilt, index)["proof"]
+    
+    # The original commitment is left untouched
+    assert list(commitment.evidence_hashes) == [item.content_hash for item in evidence]
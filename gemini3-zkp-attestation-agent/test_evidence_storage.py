@@ -0,0 +1,183 @@
+"""
+Test evidence storage formats
+Round-trips the encrypted object layouts, sharded storage keys and bundle
+decryption, including the legacy layouts still read back
+"""
+
+import asyncio
+import os
+
+import orjson
+import pytest
+
+from app.core.evidence.storage import (
+    EvidenceStorage,
+    LocalStorageBackend,
+    _legacy_storage_key,
+    _storage_key,
+)
+from app.utils.crypto import (
+    CryptoUtils,
+    ENCRYPTION_FORMAT_NONCE_HEADER,
+    ENCRYPTION_FORMAT_TRAILING_NONCE,
+)
+from app.utils.errors import CryptoError, StorageError
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return LocalStorageBackend(tmp_path)
+
+
+@pytest.fixture
+def storage(backend):
+    return EvidenceStorage(backend, master_key=os.urandom(32))
+
+
+def test_decrypt_stored_nonce_header():
+    """encrypt_stream output reads back as the nonce-header format"""
+    key = CryptoUtils.generate_key()
+    
+    async def chunks():
+        yield b"first chunk "
+        yield b"second chunk"
+    
+    async def collect():
+        return b"".join([part async for part in CryptoUtils.encrypt_stream(chunks(), key)])
+    
+    stored = asyncio.run(collect())
+    
+    assert CryptoUtils.decrypt_stored(stored, key, ENCRYPTION_FORMAT_NONCE_HEADER) == b"first chunk second chunk"
+
+
+def test_decrypt_stored_trailing_nonce():
+    """Blobs written as ciphertext | tag | nonce still decrypt"""
+    key = CryptoUtils.generate_key()
+    ciphertext, nonce = CryptoUtils.encrypt(b"legacy evidence", key)
+    
+    assert CryptoUtils.decrypt_stored(ciphertext + nonce, key, ENCRYPTION_FORMAT_TRAILING_NONCE) == b"legacy evidence"
+
+
+def test_decrypt_stored_rejects_unknown_format():
+    key = CryptoUtils.generate_key()
+    ciphertext, nonce = CryptoUtils.encrypt(b"data", key)
+    
+    with pytest.raises(ValueError):
+        CryptoUtils.decrypt_stored(ciphertext + nonce, key, 99)
+
+
+def test_encrypted_evidence_round_trip(storage, backend):
+    content = os.urandom(4096)
+    info = asyncio.run(storage.store_evidence("github:log:enc", content, {"source": "ci"}, encrypt=True))
+    
+    metadata = asyncio.run(backend.get_metadata(info["storage_key"]))
+    assert metadata["source"] == "ci"
+    assert metadata["encryption"]["format"] == ENCRYPTION_FORMAT_NONCE_HEADER
+    assert asyncio.run(backend.retrieve(info["storage_key"])) != content
+    
+    assert asyncio.run(storage.retrieve_evidence("github:log:enc")) == content
+
+
+def test_legacy_trailing_nonce_evidence_round_trip(storage, backend):
+    """Objects without a recorded format are read as trailing-nonce blobs"""
+    key = CryptoUtils.generate_key()
+    ciphertext, nonce = CryptoUtils.encrypt(b"old evidence", key)
+    storage_key = storage._generate_storage_key("github:log:old")
+    asyncio.run(backend.store(storage_key, ciphertext + nonce, {
+        "encrypted": True,
+        "encryption": {"wrapped_key": storage.key_manager.wrap_key(key)}
+    }))
+    
+    assert asyncio.run(storage.retrieve_evidence("github:log:old")) == b"old evidence"
+
+
+def test_encrypted_evidence_without_key(backend):
+    """Without a master key the wrapped key cannot be used, so reads fail loudly"""
+    storage = EvidenceStorage(backend)
+    asyncio.run(storage.store_evidence("github:log:nokey", b"secret", encrypt=True))
+    
+    with pytest.raises(CryptoError):
+        asyncio.run(storage.retrieve_evidence("github:log:nokey"))
+    
+    assert asyncio.run(storage.retrieve_evidence("github:log:nokey", decrypt=False)) != b"secret"
+
+
+def test_sharded_storage_key():
+    storage_key = _storage_key("github:log:abc123")
+    
+    source, shard1, shard2, *rest = storage_key.split("/")[1:]
+    assert source == "github"
+    assert len(shard1) == len(shard2) == 2
+    assert rest == ["log", "abc123.bin"]
+    assert _legacy_storage_key("github:log:abc123") == "evidence/github/log/abc123.bin"
+    assert _legacy_storage_key("plain") == "evidence/plain.bin"
+
+
+def test_legacy_storage_key_fallback(tmp_path, backend):
+    """Evidence stored under the unsharded layout is still found"""
+    storage = EvidenceStorage(backend)
+    legacy_key = _legacy_storage_key("github:log:legacy")
+    asyncio.run(backend.store(legacy_key, b"unsharded"))
+    
+    assert asyncio.run(storage.exists("github:log:legacy"))
+    assert asyncio.run(storage.retrieve_evidence("github:log:legacy")) == b"unsharded"
+    
+    async def stream():
+        return b"".join([chunk async for chunk in storage.stream_evidence("github:log:legacy")])
+    
+    assert asyncio.run(stream()) == b"unsharded"
+    
+    assert asyncio.run(storage.delete_evidence("github:log:legacy"))
+    assert not (tmp_path / legacy_key).exists()
+    with pytest.raises(StorageError):
+        asyncio.run(storage.retrieve_evidence("github:log:legacy"))
+
+
+def test_legacy_metadata_sidecar(tmp_path, backend):
+    """Metadata written as .meta.json sidecars before the index is still read"""
+    asyncio.run(backend.store("evidence/old.bin", b"x"))
+    backend._meta_db.execute("DELETE FROM meta")
+    (tmp_path / "evidence/old.meta.json").write_bytes(orjson.dumps({"tenant": "t1"}))
+    
+    assert asyncio.run(backend.get_metadata("evidence/old.bin")) == {"tenant": "t1"}
+
+
+def test_encrypted_bundle_round_trip(storage):
+    items = {f"github:log:{i}": os.urandom(64 + i) for i in range(8)}
+    storage.encrypt_by_default = True
+    manifest = asyncio.run(storage.store_bundle("bundle1", items))
+    
+    assert manifest["encryption"]["wrapped_key"]
+    assert all(item["encryption_info"]["bundle_id"] == "bundle1" for item in manifest["items"])
+    assert asyncio.run(storage.retrieve_bundle("bundle1")) == items
+    
+    # Members resolve the bundle key from the manifest when read on their own
+    assert asyncio.run(storage.retrieve_evidence("github:log:3")) == items["github:log:3"]
+
+
+def test_bundle_with_per_item_keys(storage, backend):
+    """Bundles whose items carry their own wrapped keys decrypt per item"""
+    items = {"github:log:a": b"alpha", "github:log:b": b"beta"}
+    stored = [
+        asyncio.run(storage.store_evidence(evidence_id, content, encrypt=True))
+        for evidence_id, content in items.items()
+    ]
+    asyncio.run(backend.store("bundles/old/manifest.json", orjson.dumps({
+        "bundle_id": "old",
+        "evidence_count": len(stored),
+        "items": stored,
+        "encryption": None
+    })))
+    
+    assert asyncio.run(storage.retrieve_bundle("old")) == items
+
+
+def test_encrypted_bundle_without_key(backend):
+    storage = EvidenceStorage(backend)
+    storage.encrypt_by_default = True
+    asyncio.run(storage.store_bundle("nokey", {"github:log:x": b"secret"}))
+    
+    with pytest.raises(CryptoError):
+        asyncio.run(storage.retrieve_bundle("nokey"))
+    with pytest.raises(CryptoError):
+        asyncio.run(storage.retrieve_evidence("github:log:x"))
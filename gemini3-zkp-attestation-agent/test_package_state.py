@@ -0,0 +1,111 @@
+"""
+Test attestation package persistence
+Round-trips the package state sidecar and the package listing index
+"""
+
+import types
+from datetime import datetime
+
+import pytest
+
+from app.core.attestation.package_builder import AttestationPackageBuilder, AttestationStatus
+
+
+def make_package(builder, claim_id, tenant_id="tenant1"):
+    claim = types.SimpleNamespace(
+        claim_id=claim_id,
+        claim_type="control",
+        claim_statement="Statement",
+        tenant_id=tenant_id,
+        status="active",
+        created_at=datetime(2024, 1, 1)
+    )
+    package = builder.create_package(claim, "Title", "Description", "soc2", {"name": "Issuer"})
+    bundle = types.SimpleNamespace(
+        bundle_id=f"bundle_{claim_id}",
+        evidence_count=2,
+        merkle_root="ab" * 32,
+        created_at=datetime(2024, 1, 2)
+    )
+    builder.add_evidence_bundle(package, bundle)
+    builder.assemble_package(package)
+    return package
+
+
+@pytest.fixture
+def builder(tmp_path):
+    return AttestationPackageBuilder(tmp_path)
+
+
+def test_status_change_writes_sidecar(builder, tmp_path):
+    package = make_package(builder, "c1")
+    package_file = tmp_path / f"{package.package_id}.json"
+    content = package_file.read_bytes()
+    
+    builder.update_package_status(package, AttestationStatus.PUBLISHED)
+    
+    # Only the sidecar changes; the package content is not rewritten
+    assert package_file.read_bytes() == content
+    assert (tmp_path / f"{package.package_id}.state.json").exists()
+    
+    loaded = AttestationPackageBuilder(tmp_path).load_package(package.package_id)
+    assert loaded.status == AttestationStatus.PUBLISHED
+    assert loaded.published_at == package.published_at
+    assert loaded.package_hash == package.package_hash
+
+
+def test_full_store_clears_sidecar(builder, tmp_path):
+    package = make_package(builder, "c1")
+    builder.update_package_status(package, AttestationStatus.PUBLISHED)
+    
+    builder._store_package(package)
+    
+    assert not (tmp_path / f"{package.package_id}.state.json").exists()
+    assert AttestationPackageBuilder(tmp_path).load_package(package.package_id).status == AttestationStatus.PUBLISHED
+
+
+def test_package_without_sidecar_loads(builder, tmp_path):
+    """Packages stored before the sidecar existed load from the full document"""
+    package = make_package(builder, "c1")
+    
+    assert not (tmp_path / f"{package.package_id}.state.json").exists()
+    loaded = AttestationPackageBuilder(tmp_path).load_package(package.package_id)
+    assert loaded.status == package.status
+    assert loaded.package_hash == package.package_hash
+
+
+def test_listing_applies_sidecar_state(builder, tmp_path):
+    published = make_package(builder, "c1")
+    make_package(builder, "c2")
+    make_package(builder, "c3", tenant_id="tenant2")
+    builder.update_package_status(published, AttestationStatus.PUBLISHED)
+    
+    # A fresh builder builds its index from disk on the first listing
+    fresh = AttestationPackageBuilder(tmp_path)
+    listed = fresh.list_packages(tenant_id="tenant1", status=AttestationStatus.PUBLISHED)
+    assert [package.package_id for package in listed] == [published.package_id]
+    
+    assert len(fresh.list_packages(tenant_id="tenant1")) == 2
+    summaries = fresh.list_package_summaries(status=AttestationStatus.ASSEMBLED)
+    assert len(summaries) == 2
+    assert {summary["package_id"] for summary in summaries} == {
+        package.package_id for package in fresh.list_packages(status=AttestationStatus.ASSEMBLED)
+    }
+
+
+def test_cold_listing_reads_each_package_once(builder, tmp_path, monkeypatch):
+    for index in range(4):
+        make_package(builder, f"c{index}")
+    
+    reads = []
+    original = AttestationPackageBuilder._read_package_data
+    
+    def counting(self, package_file):
+        reads.append(package_file.name)
+        return original(self, package_file)
+    
+    monkeypatch.setattr(AttestationPackageBuilder, "_read_package_data", counting)
+    
+    fresh = AttestationPackageBuilder(tmp_path)
+    assert len(fresh.list_packages(tenant_id="tenant1")) == 4
+    assert len(reads) == 4
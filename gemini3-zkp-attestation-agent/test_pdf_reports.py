@@ -0,0 +1,112 @@
+"""
+Test PDF report caching
+Checks that full reports are keyed by render options and package content,
+reused from the report index and cleaned up when the content changes
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.core.attestation.package_builder import AttestationPackage, AttestationStatus
+from app.core.attestation.pdf_generator import PDFGenerator, _INDEX_FILENAME
+
+
+def make_package(assembled=True):
+    package = AttestationPackage(
+        package_id="pkg_1",
+        claim_id="c1",
+        tenant_id="tenant1",
+        title="Title",
+        description="Description",
+        claim_data={},
+        issuer={"name": "Issuer"},
+        attestation_type="soc2",
+        compliance_framework="SOC2",
+        valid_from=datetime(2024, 1, 1),
+        assessment_date=datetime(2024, 1, 2),
+        evidence_bundles=[{"bundle_id": "b1", "evidence_count": 2, "merkle_root": "ab" * 32, "created_at": "2024-01-01T00:00:00"}],
+        proofs=[{"proof_id": "p1", "circuit_type": "merkle", "template_id": "t1", "proof_hash": "cd" * 32, "proving_time": 0.5}],
+        status=AttestationStatus.ASSEMBLED if assembled else AttestationStatus.DRAFT
+    )
+    if assembled:
+        package.package_hash = "12" * 32
+    return package
+
+
+@pytest.fixture
+def generator(tmp_path):
+    return PDFGenerator(tmp_path)
+
+
+def index_lines(generator):
+    return (generator.output_path / _INDEX_FILENAME).read_bytes().splitlines()
+
+
+def pdf_names(generator):
+    return sorted(path.name for path in generator.output_path.glob("*.pdf"))
+
+
+def test_same_content_reuses_report(generator):
+    package = make_package()
+    first = generator.generate_attestation_report(package)
+    
+    for _ in range(3):
+        again = generator.generate_attestation_report(package)
+        assert again.file_path == first.file_path
+        assert again.generated_at == first.generated_at
+    
+    assert len(index_lines(generator)) == 1
+
+
+def test_cache_key_file_name(generator):
+    package = make_package()
+    report = generator.generate_attestation_report(package)
+    
+    options_key = PDFGenerator._options_key(True, True, "standard")
+    render_key = generator._render_key(package)
+    assert report.file_path.endswith(f"pkg_1_report_{options_key}_{render_key}.pdf")
+
+
+def test_options_are_cached_separately(generator):
+    package = make_package()
+    full = generator.generate_attestation_report(package)
+    without_proofs = generator.generate_attestation_report(package, include_proofs=False)
+    
+    assert full.file_path != without_proofs.file_path
+    assert len(pdf_names(generator)) == 2
+
+
+def test_changed_content_replaces_stale_report(generator):
+    package = make_package()
+    without_proofs = generator.generate_attestation_report(package, include_proofs=False)
+    generator.generate_attestation_report(package)
+    
+    package.title = "Changed"
+    current = generator.generate_attestation_report(package)
+    
+    # The older full report is removed; other render options are kept
+    names = pdf_names(generator)
+    assert len(names) == 2
+    assert current.file_path.rsplit("/", 1)[-1] in names
+    assert without_proofs.file_path.rsplit("/", 1)[-1] in names
+    assert [report.file_path for report in generator.list_reports()] == [current.file_path]
+
+
+def test_cache_survives_restart(generator):
+    package = make_package()
+    first = generator.generate_attestation_report(package)
+    
+    reloaded = PDFGenerator(generator.output_path).generate_attestation_report(package)
+    
+    assert reloaded.file_path == first.file_path
+    assert reloaded.generated_at == first.generated_at
+    assert len(index_lines(generator)) == 1
+
+
+def test_unassembled_package_is_not_cached(generator):
+    package = make_package(assembled=False)
+    report = generator.generate_attestation_report(package)
+    
+    assert report.file_path.endswith("pkg_1_report.pdf")
+    assert generator._render_key(package) is None